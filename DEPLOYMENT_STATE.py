@@ -7,9 +7,38 @@ Runtime: Podman 5.7.1
 """
 
 import json
-from typing import Dict, List, Any
+import sys
+from functools import cache
+from typing import Dict, Any, Mapping, Tuple
 from datetime import datetime
 from enum import Enum
+from types import MappingProxyType
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to stdlib json
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # msgspec is optional; only needed for MessagePack export
+    msgspec = None
+
+JSON_MEDIA_TYPE = "application/json"
+MSGPACK_MEDIA_TYPE = "application/vnd.msgpack"
+
+def _freeze(obj: Any) -> Any:
+    """Recursively convert dicts to read-only mappings, lists to tuples, and intern strings"""
+    if isinstance(obj, dict):
+        return MappingProxyType({
+            sys.intern(k) if isinstance(k, str) else k: _freeze(v)
+            for k, v in obj.items()
+        })
+    if isinstance(obj, list):
+        return tuple(_freeze(v) for v in obj)
+    if isinstance(obj, str):
+        return sys.intern(obj)
+    return obj
 
 class ServiceStatus(Enum):
     """Service status enumeration"""
@@ -312,6 +341,24 @@ DEPLOYMENT_STATE = {
     }
 }
 
+DEPLOYMENT_STATE = _freeze(DEPLOYMENT_STATE)
+
+# Precomputed lookups (DEPLOYMENT_STATE is static, so these never change)
+_CROSS_NETWORK_SERVICES: Tuple[str, ...] = tuple(
+    name for name, cfg in DEPLOYMENT_STATE["services"].items()
+    if len(cfg.get("networks", ())) > 1
+)
+
+_NETWORK_INDEX: Dict[str, Tuple[str, ...]] = {
+    name: tuple(net.get("services", ()))
+    for name, net in DEPLOYMENT_STATE["networks"].items()
+}
+
+_SERVICE_NETWORK_NAMES: Dict[str, str] = {
+    name: ", ".join(n["name"] for n in cfg.get("networks", ()))
+    for name, cfg in DEPLOYMENT_STATE["services"].items()
+}
+
 # ============================================================================
 # CONTEXT DIGEST - FOR AI SYSTEM PROMPTS
 # ============================================================================
@@ -369,72 +416,124 @@ CONTEXT_DIGEST = {
     }
 }
 
+CONTEXT_DIGEST = _freeze(CONTEXT_DIGEST)
+
 # ============================================================================
 # HELPER FUNCTIONS
 # ============================================================================
 
-def get_service_by_name(service_name: str) -> Dict[str, Any]:
+def get_service_by_name(service_name: str) -> Mapping[str, Any]:
     """Get service configuration by name"""
     return DEPLOYMENT_STATE["services"].get(service_name)
 
-def get_network_services(network_name: str) -> List[str]:
+def get_network_services(network_name: str) -> Tuple[str, ...]:
     """Get all services on a specific network"""
-    return DEPLOYMENT_STATE["networks"].get(network_name, {}).get("services", [])
+    return _NETWORK_INDEX.get(network_name, ())
 
-def get_cross_network_services() -> List[str]:
+def get_cross_network_services() -> Tuple[str, ...]:
     """Get services that span multiple networks"""
-    services = []
-    for name, config in DEPLOYMENT_STATE["services"].items():
-        if len(config.get("networks", [])) > 1:
-            services.append(name)
-    return services
+    return _CROSS_NETWORK_SERVICES
 
-def validate_deployment() -> Dict[str, bool]:
-    """Validate deployment state"""
+@cache
+def validate_deployment() -> Mapping[str, bool]:
+    """Validate deployment state (a read-only view, shared by all callers)"""
+    up = ServiceStatus.UP.value
+    verified = "VERIFIED"
     checks = {
         "all_services_up": all(
-            svc.get("status") == ServiceStatus.UP.value 
+            svc.get("status") == up
             for svc in DEPLOYMENT_STATE["services"].values()
         ),
         "file_transfer_verified": DEPLOYMENT_STATE["verified_operations"]["file_transfer"]["result"] == "SUCCESS",
         "networking_verified": all(
-            v.get("status") == "VERIFIED"
+            v.get("status") == verified
             for v in DEPLOYMENT_STATE["verified_operations"]["network_connectivity"].values()
         ),
         "mime_server_dual_network": len(get_service_by_name("mime-server")["networks"]) == 2,
         "logging_compliant": DEPLOYMENT_STATE["logging_system"]["compliance"] != ""
     }
-    return checks
+    return MappingProxyType(checks)
 
 def print_deployment_summary():
     """Print a human-readable summary of deployment state"""
-    print("\n" + "=" * 70)
-    print("DEPLOYMENT STATE SUMMARY".center(70))
-    print("=" * 70)
-    
-    print(f"\nTimestamp: {DEPLOYMENT_STATE['timestamp']}")
-    print(f"Runtime: {DEPLOYMENT_STATE['runtime']['container_engine']} {DEPLOYMENT_STATE['runtime']['version']}")
-    
-    print("\n--- Services ---")
+    rows = [
+        "",
+        "=" * 70,
+        "DEPLOYMENT STATE SUMMARY".center(70),
+        "=" * 70,
+        "",
+        f"Timestamp: {DEPLOYMENT_STATE['timestamp']}",
+        f"Runtime: {DEPLOYMENT_STATE['runtime']['container_engine']} {DEPLOYMENT_STATE['runtime']['version']}",
+        "",
+        "--- Services ---",
+    ]
     for name, config in DEPLOYMENT_STATE["services"].items():
         status = config["status"].upper()
-        networks = ", ".join(n["name"] for n in config.get("networks", []))
-        print(f"  {name:15} {status:8} Networks: {networks}")
+        rows.append(f"  {name:15} {status:8} Networks: {_SERVICE_NETWORK_NAMES[name]}")
     
-    print("\n--- Verified Operations ---")
-    print(f"  File Transfer:        {DEPLOYMENT_STATE['verified_operations']['file_transfer']['result']}")
-    print(f"  Network Connectivity: VERIFIED")
-    print(f"  All Services:         UP")
-    
-    print("\n--- Validation ---")
+    rows += [
+        "",
+        "--- Verified Operations ---",
+        f"  File Transfer:        {DEPLOYMENT_STATE['verified_operations']['file_transfer']['result']}",
+        "  Network Connectivity: VERIFIED",
+        "  All Services:         UP",
+        "",
+        "--- Validation ---",
+    ]
     checks = validate_deployment()
     for check, result in checks.items():
         status = "✓" if result else "✗"
-        print(f"  {status} {check.replace('_', ' ').title()}")
+        rows.append(f"  {status} {check.replace('_', ' ').title()}")
     
     all_passed = all(checks.values())
-    print(f"\nOverall Status: {'✓ READY FOR NEXT PHASE' if all_passed else '✗ ISSUES DETECTED'}")
-    print("=" * 70 + "\n")
+    rows += [
+        "",
+        f"Overall Status: {'✓ READY FOR NEXT PHASE' if all_passed else '✗ ISSUES DETECTED'}",
+        "=" * 70,
+        "",
+        "",
+    ]
+    sys.stdout.write("\n".join(rows))
+
+def _json_default(obj: Any) -> Any:
+    """Serialize enums by value, frozen mappings as dicts, anything else via str()"""
+    if isinstance(obj, Enum):
+        return obj.value
+    if isinstance(obj, MappingProxyType):
+        return dict(obj)
+    return str(obj)
+
+def _dumps_state(state: MappingProxyType) -> bytes:
+    """Serialize a state dict to indented JSON bytes (orjson when available)"""
+    if orjson is not None:
+        return orjson.dumps(
+            state,
+            default=_json_default,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS,
+        )
+    return json.dumps(state, indent=2, default=_json_default).encode("utf-8")
+
+# DEPLOYMENT_STATE is frozen, so its JSON export only needs encoding once
+_DEPLOYMENT_STATE_JSON: bytes = _dumps_state(DEPLOYMENT_STATE)
+
+def export_json() -> bytes:
+    """Get the deployment state as indented JSON bytes"""
+    return _DEPLOYMENT_STATE_JSON
+
+@cache
+def export_msgpack() -> bytes:
+    """Get the deployment state as MessagePack bytes for machine consumers"""
+    if msgspec is None:
+        raise RuntimeError("msgspec is required for MessagePack export")
+    return msgspec.msgpack.encode(DEPLOYMENT_STATE, enc_hook=_json_default)
+
+def export_state(media_type: str = JSON_MEDIA_TYPE) -> bytes:
+    """Export the deployment state in the requested media type"""
+    if media_type == MSGPACK_MEDIA_TYPE:
+        return export_msgpack()
+    if media_type == JSON_MEDIA_TYPE:
+        return export_json()
+    raise ValueError(f"Unsupported media type: {media_type}")
 
 # ============================================================================
 # MAIN - CAN BE USED AS LIBRARY OR SCRIPT
@@ -445,7 +544,7 @@ if __name__ == "__main__":
     print_deployment_summary()
     
     # Export as JSON for external consumption
-    state_json = json.dumps(DEPLOYMENT_STATE, indent=2, default=str)
+    state_json = export_json()
     print(f"JSON Export Size: {len(state_json)} bytes")
     print(f"Services Count: {len(DEPLOYMENT_STATE['services'])}")
     print(f"Cross-Network Services: {', '.join(get_cross_network_services())}")
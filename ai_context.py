@@ -6,23 +6,43 @@ Usage: from ai_context import * or podman run --entrypoint python CONTAINER /app
 """
 
 import json
+import re
+import sys
 from dataclasses import dataclass, asdict
-from typing import Dict, List, Optional, Tuple
+from functools import lru_cache
+from typing import Dict, Final, List, Optional, Tuple
 from enum import Enum
 from datetime import datetime
 
+try:
+    import msgspec
+except ImportError:  # msgspec is optional; fall back to dataclasses.asdict + json
+    msgspec = None
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to stdlib json
+    orjson = None
+
+# Shared string constants, interned so every record references one object
+_PUBLIC_NET = sys.intern("public_net")
+_PRIVATE_NET = sys.intern("private_net")
+_PUBLIC_SUBNET = sys.intern("172.18.0.0/16")
+_PRIVATE_SUBNET = sys.intern("172.19.0.0/16")
+_RUNNING = sys.intern("running")
+
 # ============================================================================
 # DATA CLASSES
 # ============================================================================
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ServiceEndpoint:
     """Represents a service endpoint configuration"""
     port: int
     protocol: str
     internal: bool = True
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class NetworkConfig:
     """Represents a network configuration"""
     name: str
@@ -30,7 +50,7 @@ class NetworkConfig:
     ipv4: str
     purpose: str
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Service:
     """Represents a container service"""
     name: str
@@ -51,10 +71,37 @@ class ArchitectureDecision(Enum):
     DIRECT_CONNECT = "service_direct_connection"
     ADD_LOGGING = "service_requires_audit_logging"
 
+# Requirement keywords -> decision, matched in a single pass
+_DECISION_KEYWORDS = {
+    "cross-network": ArchitectureDecision.USE_DUAL_NETWORK,
+    "bridge": ArchitectureDecision.USE_DUAL_NETWORK,
+    "isolated": ArchitectureDecision.USE_SINGLE_NETWORK,
+    "private": ArchitectureDecision.USE_SINGLE_NETWORK,
+    "external": ArchitectureDecision.GATEWAY_REQUIRED,
+    "public": ArchitectureDecision.GATEWAY_REQUIRED,
+    "compliance": ArchitectureDecision.ADD_LOGGING,
+    "audit": ArchitectureDecision.ADD_LOGGING,
+}
+_DECISION_RE = re.compile("|".join(map(re.escape, _DECISION_KEYWORDS)), re.IGNORECASE)
+_DECISION_ORDER = (
+    ArchitectureDecision.USE_DUAL_NETWORK,
+    ArchitectureDecision.USE_SINGLE_NETWORK,
+    ArchitectureDecision.GATEWAY_REQUIRED,
+    ArchitectureDecision.ADD_LOGGING,
+)
+
 # ============================================================================
 # DEPLOYMENT CONTEXT
 # ============================================================================
 
+def _to_builtins(obj):
+    """Convert a dataclass record into plain dicts/lists"""
+    if not hasattr(obj, '__dataclass_fields__'):
+        return obj
+    if msgspec is not None:
+        return msgspec.to_builtins(obj)
+    return asdict(obj)
+
 class DeploymentContext:
     """Central context for the entire deployment"""
     
@@ -65,18 +112,19 @@ class DeploymentContext:
         
         # Service Registry
         self.services: Dict[str, Service] = self._initialize_services()
+        self._build_indexes()
         
         # Network Map
         self.networks = {
-            "public_net": NetworkConfig(
-                name="public_net",
-                subnet="172.18.0.0/16",
+            _PUBLIC_NET: NetworkConfig(
+                name=_PUBLIC_NET,
+                subnet=_PUBLIC_SUBNET,
                 ipv4="172.18.0.2",  # Gateway
                 purpose="External-facing services"
             ),
-            "private_net": NetworkConfig(
-                name="private_net",
-                subnet="172.19.0.0/16",
+            _PRIVATE_NET: NetworkConfig(
+                name=_PRIVATE_NET,
+                subnet=_PRIVATE_SUBNET,
                 ipv4="172.19.0.2",  # Gateway
                 purpose="Internal-only services"
             )
@@ -98,10 +146,10 @@ class DeploymentContext:
                 image="nginx:alpine",
                 role="L7 Reverse Proxy",
                 networks=[
-                    NetworkConfig("public_net", "172.18.0.0/16", "172.18.0.2", "External-facing"),
-                    NetworkConfig("private_net", "172.19.0.0/16", "172.19.0.2", "Internal")
+                    NetworkConfig(_PUBLIC_NET, _PUBLIC_SUBNET, "172.18.0.2", "External-facing"),
+                    NetworkConfig(_PRIVATE_NET, _PRIVATE_SUBNET, "172.19.0.2", "Internal")
                 ],
-                status="running",
+                status=_RUNNING,
                 ports=[
                     ServiceEndpoint(80, "http"),
                     ServiceEndpoint(443, "https")
@@ -114,9 +162,9 @@ class DeploymentContext:
                 image="python:3.11-slim",
                 role="Public HTTP Service",
                 networks=[
-                    NetworkConfig("public_net", "172.18.0.0/16", "172.18.0.3", "External-facing")
+                    NetworkConfig(_PUBLIC_NET, _PUBLIC_SUBNET, "172.18.0.3", "External-facing")
                 ],
-                status="running",
+                status=_RUNNING,
                 ports=[ServiceEndpoint(80, "http")],
                 environment={"PYTHONIOENCODING": "utf-8"}
             ),
@@ -126,9 +174,9 @@ class DeploymentContext:
                 image="python:3.11-slim",
                 role="Private API Service",
                 networks=[
-                    NetworkConfig("private_net", "172.19.0.0/16", "172.19.0.3", "Internal")
+                    NetworkConfig(_PRIVATE_NET, _PRIVATE_SUBNET, "172.19.0.3", "Internal")
                 ],
-                status="running",
+                status=_RUNNING,
                 ports=[ServiceEndpoint(5000, "flask")],
                 environment={"PYTHONIOENCODING": "utf-8"}
             ),
@@ -138,10 +186,10 @@ class DeploymentContext:
                 image="python:3.11-slim",
                 role="MIME File Transfer Daemon",
                 networks=[
-                    NetworkConfig("public_net", "172.18.0.0/16", "172.18.0.4", "External-facing"),
-                    NetworkConfig("private_net", "172.19.0.0/16", "172.19.0.5", "Internal")
+                    NetworkConfig(_PUBLIC_NET, _PUBLIC_SUBNET, "172.18.0.4", "External-facing"),
+                    NetworkConfig(_PRIVATE_NET, _PRIVATE_SUBNET, "172.19.0.5", "Internal")
                 ],
-                status="running",
+                status=_RUNNING,
                 ports=[ServiceEndpoint(65432, "socket", internal=True)],
                 volumes={"mime_storage": "/storage"},
                 environment={
@@ -156,9 +204,9 @@ class DeploymentContext:
                 image="python:3.11-slim",
                 role="MIME Client",
                 networks=[
-                    NetworkConfig("private_net", "172.19.0.0/16", "172.19.0.4", "Internal")
+                    NetworkConfig(_PRIVATE_NET, _PRIVATE_SUBNET, "172.19.0.4", "Internal")
                 ],
-                status="running",
+                status=_RUNNING,
                 ports=[],
                 environment={
                     "PYTHONIOENCODING": "utf-8",
@@ -169,38 +217,52 @@ class DeploymentContext:
             )
         }
     
+    def _build_indexes(self):
+        """Precompute network -> services and cross-network lookups"""
+        self._by_network: Dict[str, List[Service]] = {}
+        for svc in self.services.values():
+            for net in svc.networks:
+                self._by_network.setdefault(net.name, []).append(svc)
+        self._cross_network_services = [
+            svc for svc in self.services.values() if len(svc.networks) > 1
+        ]
+    
+    def add_service(self, service: Service):
+        """Add or replace a service and refresh derived lookups"""
+        self.services[service.name] = service
+        self._build_indexes()
+    
+    def remove_service(self, name: str) -> Optional[Service]:
+        """Remove a service and refresh derived lookups"""
+        service = self.services.pop(name, None)
+        if service is not None:
+            self._build_indexes()
+        return service
+    
     def get_service(self, name: str) -> Optional[Service]:
         """Get service by name"""
         return self.services.get(name)
     
     def get_services_on_network(self, network: str) -> List[Service]:
         """Get all services on a specific network"""
-        return [
-            svc for svc in self.services.values()
-            if any(n.name == network for n in svc.networks)
-        ]
+        return list(self._by_network.get(network, ()))
     
     def get_cross_network_services(self) -> List[Service]:
         """Get services that span multiple networks"""
-        return [svc for svc in self.services.values() if len(svc.networks) > 1]
+        return list(self._cross_network_services)
     
     def decide_architecture(self, requirement: str) -> List[ArchitectureDecision]:
         """Make architectural decisions based on requirements"""
-        decisions = []
-        
-        if "cross-network" in requirement.lower() or "bridge" in requirement.lower():
-            decisions.append(ArchitectureDecision.USE_DUAL_NETWORK)
-        
-        if "isolated" in requirement.lower() or "private" in requirement.lower():
-            decisions.append(ArchitectureDecision.USE_SINGLE_NETWORK)
-        
-        if "external" in requirement.lower() or "public" in requirement.lower():
-            decisions.append(ArchitectureDecision.GATEWAY_REQUIRED)
-        
-        if "compliance" in requirement.lower() or "audit" in requirement.lower():
-            decisions.append(ArchitectureDecision.ADD_LOGGING)
-        
-        return decisions
+        matched = {
+            _DECISION_KEYWORDS[m.group(0).lower()]
+            for m in _DECISION_RE.finditer(requirement)
+        }
+        return [d for d in _DECISION_ORDER if d in matched]
+    
+    @property
+    def operational(self) -> bool:
+        """True when every verification entry passed (computed on read; the record is tiny)"""
+        return all(self.verified.values())
     
     def validate_deployment(self) -> Tuple[bool, List[str]]:
         """Validate current deployment"""
@@ -208,7 +270,7 @@ class DeploymentContext:
         
         # Check all services running
         for svc in self.services.values():
-            if svc.status != "running":
+            if svc.status != _RUNNING:
                 issues.append(f"{svc.name} is not running")
         
         # Check critical features
@@ -220,14 +282,18 @@ class DeploymentContext:
     
     def get_deployment_summary(self) -> Dict:
         """Get comprehensive deployment summary"""
+        return self._build_summary()
+    
+    def _build_summary(self) -> Dict:
+        """Compute the deployment summary from current state"""
         return {
             "timestamp": self.timestamp,
             "runtime": self.runtime,
             "status": self.status,
             "services_count": len(self.services),
-            "services_running": sum(1 for s in self.services.values() if s.status == "running"),
+            "services_running": sum(1 for s in self.services.values() if s.status == _RUNNING),
             "networks_count": len(self.networks),
-            "cross_network_services": len(self.get_cross_network_services()),
+            "cross_network_services": sum(1 for s in self.services.values() if len(s.networks) > 1),
             "verified": self.verified
         }
 
@@ -251,25 +317,25 @@ class ArchitectureDecisionEngine:
     def should_expose_to_gateway(self, service_name: str, network: str) -> bool:
         """Determine if service should be exposed through gateway"""
         # Only public_net services exposed to gateway by default
-        return network == "public_net"
+        return network == _PUBLIC_NET
     
     def recommend_configuration(self, service_type: str) -> Dict[str, any]:
         """Recommend configuration for new service"""
         recommendations = {
             "file-transfer": {
-                "networks": ["public_net", "private_net"],
+                "networks": [_PUBLIC_NET, _PRIVATE_NET],
                 "port": 65432,
                 "storage": True,
                 "logging": True
             },
             "api": {
-                "networks": ["private_net"],
+                "networks": [_PRIVATE_NET],
                 "port": 5000,
                 "storage": False,
                 "logging": True
             },
             "web": {
-                "networks": ["public_net"],
+                "networks": [_PUBLIC_NET],
                 "port": 80,
                 "storage": False,
                 "logging": True
@@ -281,41 +347,48 @@ class ArchitectureDecisionEngine:
 # COMMAND BUILDER
 # ============================================================================
 
+SERVICE_STATUS_CMD: Final = "podman-compose ps"
+START_SERVICES_CMD: Final = "cd mockup-infra && podman-compose up -d"
+STOP_SERVICES_CMD: Final = "cd mockup-infra && podman-compose down"
+VIEW_LOGS_TMPL: Final = "podman-compose logs -f {}"
+EXEC_IN_CONTAINER_TMPL: Final = "podman exec {} {}"
+TEST_FILE_TRANSFER_CMD: Final = (
+    "podman run --rm --network mockup-infra_private_net --entrypoint bash mime-client:latest "
+    "-c \"echo 'Test' > /tmp/test.txt && python /app/client.py --send /tmp/test.txt --to mime-server:65432\""
+)
+
 class PodmanCommandBuilder:
-    """Build Podman commands for various operations"""
+    """Build Podman commands for various operations (compatibility wrapper over the *_CMD constants)"""
     
     @staticmethod
     def service_status() -> str:
         """Command to check service status"""
-        return "podman-compose ps"
+        return SERVICE_STATUS_CMD
     
     @staticmethod
     def start_services() -> str:
         """Command to start all services"""
-        return "cd mockup-infra && podman-compose up -d"
+        return START_SERVICES_CMD
     
     @staticmethod
     def stop_services() -> str:
         """Command to stop all services"""
-        return "cd mockup-infra && podman-compose down"
+        return STOP_SERVICES_CMD
     
     @staticmethod
     def view_logs(service: str) -> str:
         """Command to view service logs"""
-        return f"podman-compose logs -f {service}"
+        return VIEW_LOGS_TMPL.format(service)
     
     @staticmethod
     def exec_in_container(container: str, command: str) -> str:
         """Build exec command"""
-        return f"podman exec {container} {command}"
+        return EXEC_IN_CONTAINER_TMPL.format(container, command)
     
     @staticmethod
     def test_file_transfer() -> str:
         """Command to test file transfer"""
-        return (
-            "podman run --rm --network mockup-infra_private_net --entrypoint bash mime-client:latest "
-            "-c \"echo 'Test' > /tmp/test.txt && python /app/client.py --send /tmp/test.txt --to mime-server:65432\""
-        )
+        return TEST_FILE_TRANSFER_CMD
 
 # ============================================================================
 # MAIN CONTEXT & EXPORTS
@@ -330,58 +403,83 @@ DECISION_ENGINE = ArchitectureDecisionEngine(DEPLOYMENT)
 # Command builder
 COMMANDS = PodmanCommandBuilder()
 
+# Reusable encoders (construction dominates cost for small payloads)
+if msgspec is not None:
+    JSON_ENCODER = msgspec.json.Encoder()
+    MSGPACK_ENCODER = msgspec.msgpack.Encoder()
+else:
+    JSON_ENCODER = None
+    MSGPACK_ENCODER = None
+
 # ============================================================================
 # UTILITY FUNCTIONS FOR AI CONTEXT
 # ============================================================================
 
 def get_deployment_info() -> Dict:
-    """Get all deployment information for AI context"""
+    """Get all deployment information for AI context (built fresh on each call)"""
+    summary = DEPLOYMENT.get_deployment_summary()
+    summary["verified"] = dict(summary["verified"])
     return {
-        "deployment": DEPLOYMENT.get_deployment_summary(),
-        "services": {
-            name: asdict(svc) if hasattr(svc, '__dataclass_fields__') else svc
-            for name, svc in DEPLOYMENT.services.items()
-        },
-        "networks": {
-            name: asdict(net) if hasattr(net, '__dataclass_fields__') else net
-            for name, net in DEPLOYMENT.networks.items()
-        },
-        "verification": DEPLOYMENT.verified,
-        "operational": all(DEPLOYMENT.verified.values())
+        "deployment": summary,
+        "services": {name: _to_builtins(svc) for name, svc in DEPLOYMENT.services.items()},
+        "networks": {name: _to_builtins(net) for name, net in DEPLOYMENT.networks.items()},
+        "verification": dict(DEPLOYMENT.verified),
+        "operational": DEPLOYMENT.operational
     }
 
+def export_json() -> bytes:
+    """Encode deployment information as JSON bytes"""
+    if JSON_ENCODER is not None:
+        return JSON_ENCODER.encode(get_deployment_info())
+    if orjson is not None:
+        return orjson.dumps(get_deployment_info())
+    return json.dumps(get_deployment_info()).encode("utf-8")
+
+def export_msgpack() -> bytes:
+    """Encode deployment information as MessagePack bytes (requires msgspec)"""
+    if MSGPACK_ENCODER is None:
+        raise RuntimeError("msgspec is required for MessagePack export")
+    return MSGPACK_ENCODER.encode(get_deployment_info())
+
+_REPORT_RULE = "=" * 70 + "\n"
+_REPORT_HEADER = "\n" + _REPORT_RULE + "DEPLOYMENT CONTEXT INFORMATION".center(70) + "\n" + _REPORT_RULE
+_REPORT_FOOTER = _REPORT_RULE + "\n"
+
+@lru_cache(maxsize=None)
+def _check_title(check: str) -> str:
+    """Display title for a verification key, e.g. file_transfer -> File Transfer"""
+    return check.replace('_', ' ').title()
+
 def print_deployment_info():
     """Print deployment information to console"""
-    print("\n" + "=" * 70)
-    print("DEPLOYMENT CONTEXT INFORMATION".center(70))
-    print("=" * 70)
-    
     summary = DEPLOYMENT.get_deployment_summary()
-    print(f"\nTimestamp: {summary['timestamp']}")
-    print(f"Runtime: {summary['runtime']}")
-    print(f"Status: {summary['status']}")
-    print(f"Services: {summary['services_running']}/{summary['services_count']} running")
-    print(f"Networks: {summary['networks_count']}")
-    print(f"Cross-Network Services: {summary['cross_network_services']}")
-    
-    print("\n--- Services ---")
-    for name, svc in DEPLOYMENT.services.items():
-        networks = ", ".join(n.name for n in svc.networks)
-        print(f"  {name:20} {svc.status:8} Networks: {networks}")
-    
-    print("\n--- Verification ---")
-    for check, result in DEPLOYMENT.verified.items():
-        status = "✓" if result else "✗"
-        print(f"  {status} {check.replace('_', ' ').title()}")
+    summary_block = (
+        f"\nTimestamp: {summary['timestamp']}\n"
+        f"Runtime: {summary['runtime']}\n"
+        f"Status: {summary['status']}\n"
+        f"Services: {summary['services_running']}/{summary['services_count']} running\n"
+        f"Networks: {summary['networks_count']}\n"
+        f"Cross-Network Services: {summary['cross_network_services']}\n"
+    )
+    services_block = "\n--- Services ---\n" + "".join(
+        f"  {name:20} {svc.status:8} Networks: {', '.join(n.name for n in svc.networks)}\n"
+        for name, svc in DEPLOYMENT.services.items()
+    )
+    verification_block = "\n--- Verification ---\n" + "".join(
+        f"  {'✓' if result else '✗'} {_check_title(check)}\n"
+        for check, result in DEPLOYMENT.verified.items()
+    )
     
     is_valid, issues = DEPLOYMENT.validate_deployment()
-    print(f"\nDeployment Valid: {'✓ YES' if is_valid else '✗ NO (issues: ' + ', '.join(issues) + ')'}")
-    print("=" * 70 + "\n")
+    validity = f"\nDeployment Valid: {'✓ YES' if is_valid else '✗ NO (issues: ' + ', '.join(issues) + ')'}\n"
+    sys.stdout.write(
+        _REPORT_HEADER + summary_block + services_block + verification_block + validity + _REPORT_FOOTER
+    )
 
 if __name__ == "__main__":
     print_deployment_info()
     print("\nUsage as library:")
-    print("  from ai_context import DEPLOYMENT, DECISION_ENGINE, COMMANDS")
+    print("  from ai_context import DEPLOYMENT, DECISION_ENGINE, TEST_FILE_TRANSFER_CMD")
     print("  service = DEPLOYMENT.get_service('mime-server')")
     print("  decisions = DECISION_ENGINE.recommend_configuration('file-transfer')")
-    print("  cmd = COMMANDS.test_file_transfer()")
+    print("  cmd = TEST_FILE_TRANSFER_CMD")
@@ -4,35 +4,159 @@ Replay recorded traffic patterns for load testing
 Useful for validating SLA compliance
 """
 
+import asyncio
+import errno
+import queue
+import selectors
 import socket
+import struct
 import time
 import random
 import sys
 from pathlib import Path
 
+MAX_FILE_KB = 500
+
+# Shared payload: test files are zero-copy slices of one preallocated buffer
+_PAYLOAD = memoryview(b'X' * (MAX_FILE_KB * 1024))
+
+SOCKET_TIMEOUT = 10
+RETRY_BACKOFF = 0.05
+
+def random_size_kb(max_kb):
+    """Pick a file size uniformly in [1, max_kb] KB"""
+    return 1 + int(random.random() * max_kb)
+
+def backoff_delay(attempt):
+    """Exponential retry delay: 50 ms, 100 ms, 200 ms, ..."""
+    return RETRY_BACKOFF * (1 << attempt)
+
+def set_io_timeout(sock, seconds):
+    """Bound blocking connect/send/recv via SO_SNDTIMEO/SO_RCVTIMEO.
+    
+    Unlike settimeout(), the socket stays in blocking mode, so Python
+    doesn't toggle O_NONBLOCK and poll around every call.
+    """
+    if sys.platform == 'win32':
+        sock.settimeout(seconds)
+        return
+    timeval = struct.pack('ll', int(seconds), int((seconds % 1) * 1_000_000))
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDTIMEO, timeval)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVTIMEO, timeval)
+
+def sendmsg_all(sock, buffers):
+    """Scatter-gather send of all buffers without concatenating them"""
+    if not hasattr(sock, 'sendmsg'):  # Windows
+        sock.sendall(b''.join(buffers))
+        return
+    views = [memoryview(b).cast('B') for b in buffers]
+    while views:
+        sent = sock.sendmsg(views)
+        while sent:
+            if sent >= len(views[0]):
+                sent -= len(views.pop(0))
+            else:
+                views[0] = views[0][sent:]
+                sent = 0
+
+def abort_socket(sock):
+    """Close with an RST (SO_LINGER 0) so failed attempts skip TIME_WAIT"""
+    try:
+        linger = struct.pack('HH' if sys.platform == 'win32' else 'ii', 1, 0)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, linger)
+    except OSError:
+        pass
+    sock.close()
+
+try:
+    import uvloop
+except ImportError:  # uvloop is optional; the default asyncio loop still works
+    uvloop = None
+
 class TrafficReplayer:
-    def __init__(self, host='mime-server', port=65432):
+    def __init__(self, host='mime-server', port=65432, pool_size=0):
         self.host = host
         self.port = port
         self.session_id = random.randint(1000, 9999)
+        # pool_size > 0 reuses keep-alive connections and length-prefixes each
+        # file (4-byte big-endian size); the server must read that framing
+        self.pool_size = pool_size
+        self._pool = queue.Queue()
+    
+    def _connect(self):
+        """Open a low-latency keep-alive connection for the pool"""
+        sock = socket.create_connection((self.host, self.port), timeout=SOCKET_TIMEOUT)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        if hasattr(socket, 'TCP_KEEPIDLE'):  # Linux-only tuning
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, 30)
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, 10)
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPCNT, 3)
+        return sock
+    
+    def _acquire(self):
+        """Take a pooled connection, opening a new one if none is idle"""
+        try:
+            return self._pool.get_nowait()
+        except queue.Empty:
+            return self._connect()
+    
+    def _release(self, sock):
+        """Return a connection to the pool, closing it if the pool is full"""
+        if self._pool.qsize() < self.pool_size:
+            self._pool.put(sock)
+        else:
+            sock.close()
+    
+    def close(self):
+        """Close all pooled connections"""
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                return
     
     def generate_test_file(self, size_kb=10):
-        """Generate random test file data"""
+        """Generate test file data (a view of the shared payload when it fits)"""
+        if size_kb <= MAX_FILE_KB:
+            return _PAYLOAD[:size_kb * 1024]
         return b'X' * (size_kb * 1024)
     
     def send_file(self, file_data, retry_count=3):
         """Send file with retry logic"""
+        if self.pool_size:
+            return self._send_framed(file_data, retry_count)
         for attempt in range(retry_count):
+            sock = None
             try:
                 sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                sock.settimeout(10)
+                set_io_timeout(sock, SOCKET_TIMEOUT)
                 sock.connect((self.host, self.port))
                 sock.sendall(file_data)
                 sock.close()
                 return True
             except Exception as e:
+                if sock is not None:
+                    abort_socket(sock)
                 print(f"  Attempt {attempt + 1}/{retry_count} failed: {e}")
-                time.sleep(1)
+                time.sleep(backoff_delay(attempt))
+        return False
+    
+    def _send_framed(self, file_data, retry_count):
+        """Send one length-prefixed file over a pooled connection"""
+        header = struct.pack('!I', len(file_data))
+        for attempt in range(retry_count):
+            sock = None
+            try:
+                sock = self._acquire()
+                sendmsg_all(sock, (header, file_data))
+                self._release(sock)
+                return True
+            except OSError as e:
+                if sock is not None:
+                    abort_socket(sock)
+                print(f"  Attempt {attempt + 1}/{retry_count} failed: {e}")
+                time.sleep(backoff_delay(attempt))
         return False
     
     def replay_normal_load(self, duration_seconds=60, files_per_second=1):
@@ -43,7 +167,7 @@ class TrafficReplayer:
         failure_count = 0
         
         while time.time() - start_time < duration_seconds:
-            file_data = self.generate_test_file(random.randint(1, 100))
+            file_data = self.generate_test_file(random_size_kb(100))
             if self.send_file(file_data):
                 success_count += 1
             else:
@@ -61,7 +185,7 @@ class TrafficReplayer:
         failure_count = 0
         
         while time.time() - start_time < spike_duration:
-            file_data = self.generate_test_file(random.randint(1, 500))
+            file_data = self.generate_test_file(random_size_kb(500))
             if self.send_file(file_data):
                 success_count += 1
             else:
@@ -71,13 +195,174 @@ class TrafficReplayer:
         
         return success_count, failure_count
 
-if __name__ == '__main__':
-    replayer = TrafficReplayer()
+class BatchReplayer(TrafficReplayer):
+    """Replay traffic with many connections in flight per event-loop pass.
+
+    Non-blocking sockets are multiplexed on one selector (epoll on Linux), so
+    connect/send readiness for a whole batch is reaped per syscall instead of
+    paying one blocking round trip per file.
+    """
+    
+    def __init__(self, host='mime-server', port=65432, depth=64, timeout=10):
+        super().__init__(host, port)
+        self.depth = depth
+        self.timeout = timeout
+    
+    def send_batch(self, payloads):
+        """Send each payload on its own connection, returns (success, failure)"""
+        addr = socket.getaddrinfo(self.host, self.port, socket.AF_INET, socket.SOCK_STREAM)[0][4]
+        sel = selectors.DefaultSelector()
+        pending = iter(payloads)
+        success_count = 0
+        failure_count = 0
+        
+        def finish(sock, ok):
+            nonlocal success_count, failure_count
+            sel.unregister(sock)
+            sock.close()
+            if ok:
+                success_count += 1
+            else:
+                failure_count += 1
+        
+        def refill():
+            nonlocal failure_count
+            while len(sel.get_map()) < self.depth:
+                data = next(pending, None)
+                if data is None:
+                    return
+                sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+                sock.setblocking(False)
+                err = sock.connect_ex(addr)
+                if err not in (0, errno.EINPROGRESS):
+                    sock.close()
+                    failure_count += 1
+                    continue
+                sel.register(sock, selectors.EVENT_WRITE, [memoryview(data), False])
+        
+        try:
+            refill()
+            while sel.get_map():
+                events = sel.select(timeout=self.timeout)
+                if not events:
+                    # Nothing progressed within the timeout: fail everything in flight
+                    for key in list(sel.get_map().values()):
+                        finish(key.fileobj, False)
+                    refill()
+                    continue
+                for key, _ in events:
+                    sock, state = key.fileobj, key.data
+                    if not state[1]:
+                        if sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR):
+                            finish(sock, False)
+                            continue
+                        state[1] = True
+                    try:
+                        sent = sock.send(state[0])
+                    except BlockingIOError:
+                        continue
+                    except OSError:
+                        finish(sock, False)
+                        continue
+                    state[0] = state[0][sent:]
+                    if not state[0]:
+                        finish(sock, True)
+                refill()
+        finally:
+            sel.close()
+        
+        return success_count, failure_count
+    
+    def _replay_batched(self, duration_seconds, files_per_second, max_kb):
+        """Send one batch of files_per_second files per one-second tick"""
+        per_tick = max(1, int(round(files_per_second)))
+        start_time = time.time()
+        success_count = 0
+        failure_count = 0
+        
+        while time.time() - start_time < duration_seconds:
+            tick_start = time.time()
+            batch = [self.generate_test_file(random_size_kb(max_kb)) for _ in range(per_tick)]
+            success, failures = self.send_batch(batch)
+            success_count += success
+            failure_count += failures
+            time.sleep(max(0.0, 1.0 - (time.time() - tick_start)))
+        
+        return success_count, failure_count
+    
+    def replay_normal_load(self, duration_seconds=60, files_per_second=1):
+        """Replay normal traffic pattern in per-second batches"""
+        print(f"Replaying normal load (batched): {files_per_second} files/sec for {duration_seconds}s")
+        return self._replay_batched(duration_seconds, files_per_second, 100)
+    
+    def replay_spike_load(self, spike_duration=10, files_per_second=10):
+        """Replay spike traffic pattern in per-second batches"""
+        print(f"Replaying spike load (batched): {files_per_second} files/sec for {spike_duration}s")
+        return self._replay_batched(spike_duration, files_per_second, 500)
+
+class AsyncTrafficReplayer(TrafficReplayer):
+    """Replay traffic at the requested rate with overlapping connections.
+    
+    Sends are scheduled every 1/files_per_second seconds regardless of how
+    long earlier sends take, bounded by a concurrency semaphore.
+    """
+    
+    def __init__(self, host='mime-server', port=65432, concurrency=100, timeout=10):
+        super().__init__(host, port)
+        self.concurrency = concurrency
+        self.timeout = timeout
+    
+    async def _send_one(self, size_kb, sem):
+        """Open a connection, send one file, and close it"""
+        async with sem:
+            reader, writer = await asyncio.wait_for(
+                asyncio.open_connection(self.host, self.port), self.timeout
+            )
+            try:
+                writer.write(self.generate_test_file(size_kb))
+                await asyncio.wait_for(writer.drain(), self.timeout)
+            finally:
+                writer.close()
+                await writer.wait_closed()
+    
+    async def _replay(self, duration_seconds, files_per_second, max_kb):
+        """Schedule sends at a fixed rate and count outcomes"""
+        sem = asyncio.Semaphore(self.concurrency)
+        interval = 1.0 / files_per_second
+        loop = asyncio.get_running_loop()
+        start_time = loop.time()
+        tasks = []
+        
+        while loop.time() - start_time < duration_seconds:
+            tasks.append(asyncio.create_task(self._send_one(random_size_kb(max_kb), sem)))
+            await asyncio.sleep(interval)
+        
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        failure_count = sum(1 for r in results if isinstance(r, BaseException))
+        return len(results) - failure_count, failure_count
+    
+    async def replay_normal_load(self, duration_seconds=60, files_per_second=1):
+        """Replay normal traffic pattern"""
+        print(f"Replaying normal load (async): {files_per_second} files/sec for {duration_seconds}s")
+        return await self._replay(duration_seconds, files_per_second, 100)
+    
+    async def replay_spike_load(self, spike_duration=10, files_per_second=10):
+        """Replay spike traffic pattern"""
+        print(f"Replaying spike load (async): {files_per_second} files/sec for {spike_duration}s")
+        return await self._replay(spike_duration, files_per_second, 500)
+
+async def main():
+    replayer = AsyncTrafficReplayer()
     
     print("=== Load Test: Normal Traffic ===")
-    success, failures = replayer.replay_normal_load(duration_seconds=30, files_per_second=2)
+    success, failures = await replayer.replay_normal_load(duration_seconds=30, files_per_second=2)
     print(f"Results: {success} success, {failures} failures")
     
     print("\n=== Load Test: Spike Traffic ===")
-    success, failures = replayer.replay_spike_load(spike_duration=10, files_per_second=5)
+    success, failures = await replayer.replay_spike_load(spike_duration=10, files_per_second=5)
     print(f"Results: {success} success, {failures} failures")
+
+if __name__ == '__main__':
+    if uvloop is not None:
+        uvloop.install()
+    asyncio.run(main())
@@ -3,7 +3,11 @@ Health check endpoints for Python applications
 Add these to your Flask/FastAPI application
 """
 
-from flask import Flask, jsonify
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from flask import Flask, Response, jsonify
 from datetime import datetime
 
 app = Flask(__name__)
@@ -11,12 +15,79 @@ app = Flask(__name__)
 # Database connection pool (example)
 db_pool = None
 
-@app.route('/health/live', methods=['GET'])
+# Readiness results are reused for this long so frequent probes
+# don't turn into a DB round trip each
+CHECK_CACHE_TTL = 5.0
+_check_cache = {}
+
+def _cached(key, fn, ttl=CHECK_CACHE_TTL):
+    """Return fn()'s result, recomputing at most once per ttl seconds"""
+    now = time.monotonic()
+    hit = _check_cache.get(key)
+    if hit is not None and now - hit[0] < ttl:
+        return hit[1]
+    result = fn()
+    _check_cache[key] = (now, result)
+    return result
+
+# Uncached readiness checks run in parallel under one overall CHECK_TIMEOUT deadline
+CHECK_TIMEOUT = 1.5
+_EXECUTOR = ThreadPoolExecutor(max_workers=4)
+# A check that is still running (e.g. hung) is waited on again, never resubmitted,
+# so stuck checks cannot pile up and exhaust the pool
+_inflight = {}
+_inflight_lock = threading.Lock()
+
+def _run_checks(checks):
+    """Run checks concurrently (cache hits skip the pool); failures and timeouts count as False"""
+    now = time.monotonic()
+    results = {}
+    futures = {}
+    with _inflight_lock:
+        for name, fn in checks.items():
+            hit = _check_cache.get(name)
+            if hit is not None and now - hit[0] < CHECK_CACHE_TTL:
+                results[name] = hit[1]
+                continue
+            future = _inflight.get(name)
+            if future is None or future.done():
+                future = _inflight[name] = _EXECUTOR.submit(_cached, name, fn)
+            futures[name] = future
+    done, _ = wait(futures.values(), timeout=CHECK_TIMEOUT)
+    for name, future in futures.items():
+        try:
+            results[name] = future.result() if future in done else False
+        except Exception:
+            results[name] = False
+    return {name: results[name] for name in checks}
+
+# Liveness answers are constant, so the body and headers are built once
+_LIVE_BODY = b'{"status":"alive","service":"app"}'
+_LIVE_HEADERS = [
+    ('Content-Type', 'application/json'),
+    ('Content-Length', str(len(_LIVE_BODY))),
+]
+
+@app.route('/healthz', methods=['GET'])
+def healthz():
+    """
+    Load balancer probe - no dependency checks at all
+    """
+    return 'ok', 200
+
+@app.route('/health/live', methods=['GET'], strict_slashes=False)
 def liveness():
     """
     Liveness probe - Is the service alive?
     Used by Docker/Kubernetes to restart if failing
     """
+    return Response(_LIVE_BODY, status=200, headers=_LIVE_HEADERS, direct_passthrough=True)
+
+@app.route('/health/detail', methods=['GET'], strict_slashes=False)
+def liveness_detail():
+    """
+    Liveness with timestamp and uptime, for humans and dashboards
+    """
     return jsonify({
         'status': 'alive',
         'service': 'app',
@@ -24,17 +95,17 @@ def liveness():
         'uptime_seconds': get_uptime()
     }), 200
 
-@app.route('/health/ready', methods=['GET'])
+@app.route('/health/ready', methods=['GET'], strict_slashes=False)
 def readiness():
     """
     Readiness probe - Can the service accept traffic?
     Used by load balancers to route traffic
     """
-    checks = {
-        'database': check_database_connection(),
-        'file_storage': check_storage_accessible(),
-        'dependencies': check_dependencies()
-    }
+    checks = _run_checks({
+        'database': check_database_connection,
+        'file_storage': check_storage_accessible,
+        'dependencies': check_dependencies
+    })
     
     if all(checks.values()):
         return jsonify({
@@ -57,12 +128,14 @@ def check_database_connection():
     except:
         return False
 
+STORAGE_PATH = '/storage'
+
 def check_storage_accessible():
-    """Check if storage is mounted"""
-    import os
+    """Check if storage is mounted (one stat() call; readiness caching happens in _run_checks)"""
     try:
-        return os.path.exists('/storage') or os.path.ismount('/storage')
-    except:
+        os.stat(STORAGE_PATH)
+        return True
+    except OSError:
         return False
 
 def check_dependencies():
@@ -3,43 +3,59 @@ Integration example for MIME Server tracing
 Add to week01-mime-typing/server.py
 """
 
-from jaeger_client import Config
-from opentelemetry import trace
+import os
+
+from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import BatchSpanProcessor
+from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+
+# Fraction of traces to sample (1.0 = every request; keep low in production)
+SAMPLING_RATE = float(os.getenv('JAEGER_SAMPLING_RATE', '0.01'))
+
+# Jaeger all-in-one accepts OTLP/gRPC when COLLECTOR_OTLP_ENABLED=true
+OTLP_ENDPOINT = os.getenv('OTLP_ENDPOINT', 'jaeger:4317')
+
+# One tracer per service; each provider owns a background export thread
+_TRACERS = {}
 
 def init_tracer(service_name):
-    """Initialize Jaeger tracer"""
-    config = Config(
-        config={
-            'sampler': {
-                'type': 'const',
-                'param': 1,
-            },
-            'logging': True,
-            'local_agent': {
-                'reporting_host': 'jaeger',
-                'reporting_port': 6831,
-            }
-        },
-        service_name=service_name,
-        validate=True,
+    """Initialize tracer exporting batched spans to Jaeger (cached per service name)"""
+    tracer = _TRACERS.get(service_name)
+    if tracer is not None:
+        return tracer
+    provider = TracerProvider(
+        resource=Resource.create({'service.name': service_name}),
+        sampler=ParentBased(TraceIdRatioBased(SAMPLING_RATE)),
     )
-    return config.initialize_tracer()
+    provider.add_span_processor(
+        BatchSpanProcessor(
+            OTLPSpanExporter(endpoint=OTLP_ENDPOINT, insecure=True),
+            max_export_batch_size=512,
+            schedule_delay_millis=200,
+        )
+    )
+    tracer = provider.get_tracer(service_name)
+    _TRACERS[service_name] = tracer
+    return tracer
 
 # Usage in MIME server
 tracer = init_tracer('mime-server')
 
 def handle_file_transfer(client_addr, file_data):
     """Trace file transfer operation"""
-    with tracer.start_active_span('file_transfer') as scope:
-        scope.span.set_tag('client.addr', client_addr)
-        scope.span.set_tag('file.size', len(file_data))
-        
-        with tracer.start_active_span('validate_file'):
+    with tracer.start_as_current_span('file_transfer') as span:
+        span.set_attributes({
+            'client.addr': str(client_addr),
+            'file.size': len(file_data),
+        })
+        with tracer.start_as_current_span('validate_file'):
             mime_type = detect_mime_type(file_data)
-            scope.span.set_tag('file.mime_type', mime_type)
+        span.set_attribute('file.mime_type', mime_type)
         
-        with tracer.start_active_span('store_file'):
+        # Attributes above are already on the span if storing fails
+        with tracer.start_as_current_span('store_file'):
             file_path = store_to_volume(file_data)
-            scope.span.set_tag('file.path', file_path)
-        
+        span.set_attribute('file.path', file_path)
         return file_path
@@ -6,9 +6,11 @@ Orchestrates starting both systems and running tests
 
 import subprocess
 import sys
-import os
 import time
 import signal
+import socket
+import threading
+from collections import deque
 from pathlib import Path
 
 # Fix Windows console encoding
@@ -20,6 +22,7 @@ if sys.platform == 'win32':
 AUTOMATION_ROOT = Path(__file__).parent
 MOCKUP_INFRA = AUTOMATION_ROOT / 'mockup-infra'
 WEEK01_MIME = AUTOMATION_ROOT / 'week01-mime-typing'
+MIME_SERVER_ADDR = ('localhost', 65432)
 
 def print_banner(title):
     """Print a formatted banner."""
@@ -34,12 +37,8 @@ def run_command(cmd, description, cwd=None):
     print(f"[+] {description}...")
     print(f"    Command: {' '.join(cmd)}")
     
-    if cwd:
-        original_cwd = os.getcwd()
-        os.chdir(cwd)
-    
     try:
-        result = subprocess.run(cmd, check=True, capture_output=False)
+        subprocess.run(cmd, check=True, capture_output=False, cwd=cwd)
         print(f"[OK] {description} completed\n")
         return True
     except subprocess.CalledProcessError as e:
@@ -48,9 +47,33 @@ def run_command(cmd, description, cwd=None):
     except KeyboardInterrupt:
         print(f"\n[STOP] {description} interrupted\n")
         return False
-    finally:
-        if cwd:
-            os.chdir(original_cwd)
+
+def drain_output(proc, max_lines=50):
+    """Continuously read a child's merged output so its pipe never fills.
+    
+    Returns a deque holding the most recent lines, for error reporting.
+    """
+    tail = deque(maxlen=max_lines)
+    
+    def _drain():
+        for line in proc.stdout:
+            tail.append(line)
+    
+    threading.Thread(target=_drain, daemon=True).start()
+    return tail
+
+def wait_for_port(addr, proc, timeout=5.0):
+    """Poll until addr accepts connections; gives up early if proc exits."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            return False
+        try:
+            with socket.create_connection(addr, timeout=0.1):
+                return True
+        except OSError:
+            time.sleep(0.1)
+    return False
 
 def demo_complete_workflow():
     """Run complete integration demo."""
@@ -106,16 +129,17 @@ def demo_complete_workflow():
         [sys.executable, 'manage-mime.py', 'server'],
         cwd=WEEK01_MIME,
         stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
         text=True
     )
+    mime_output = drain_output(mime_proc)
     
-    time.sleep(2)  # Give server time to start
-    
-    if mime_proc.poll() is not None:
+    if not wait_for_port(MIME_SERVER_ADDR, mime_proc):
         print("[FAIL] MIME Server failed to start")
-        print(mime_proc.stdout.read() if mime_proc.stdout else "")
-        print(mime_proc.stderr.read() if mime_proc.stderr else "")
+        if mime_proc.poll() is None:
+            mime_proc.terminate()
+        mime_proc.wait(timeout=5)
+        print("".join(mime_output))
         return False
     
     print("[OK] MIME Server started (PID: {})".format(mime_proc.pid))
@@ -0,0 +1,73 @@
+"""Tests for the deployment context exports in ai_context.py"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import ai_context
+
+
+@pytest.fixture
+def deployment(monkeypatch):
+    """A fresh DeploymentContext installed as the module-level DEPLOYMENT"""
+    context = ai_context.DeploymentContext()
+    monkeypatch.setattr(ai_context, "DEPLOYMENT", context)
+    return context
+
+
+class TestDeploymentInfo:
+    """get_deployment_info() and the exports must follow the live context"""
+
+    def test_status_change_is_exported(self, deployment):
+        deployment.status = "degraded"
+        assert ai_context.get_deployment_info()["deployment"]["status"] == "degraded"
+        assert json.loads(ai_context.export_json())["deployment"]["status"] == "degraded"
+
+    def test_direct_service_write_is_exported(self, deployment):
+        cross_network = ai_context.get_deployment_info()["deployment"]["cross_network_services"]
+        deployment.services["mime-server-2"] = deployment.services["mime-server"]
+        info = json.loads(ai_context.export_json())
+        assert "mime-server-2" in info["services"]
+        assert info["deployment"]["services_count"] == len(deployment.services)
+        assert info["deployment"]["cross_network_services"] == cross_network + 1
+
+    def test_direct_network_write_is_exported(self, deployment):
+        deployment.networks.pop("private_net")
+        info = ai_context.get_deployment_info()
+        assert list(info["networks"]) == ["public_net"]
+        assert info["deployment"]["networks_count"] == 1
+
+    def test_result_is_a_copy(self, deployment):
+        info = ai_context.get_deployment_info()
+        info["services"]["mime-server"]["networks"].clear()
+        info["deployment"]["verified"]["file_transfer"] = False
+        info["verification"].clear()
+        assert deployment.verified["file_transfer"] is True
+        fresh = ai_context.get_deployment_info()
+        assert len(fresh["services"]["mime-server"]["networks"]) == 2
+        assert fresh["operational"] is True
+
+
+class TestOperationalFlag:
+    """The operational flag must reflect every way the verification record can change"""
+
+    def test_in_place_merge(self, deployment):
+        deployment.verified |= {"file_transfer": False}
+        assert deployment.operational is False
+        assert json.loads(ai_context.export_json())["operational"] is False
+
+    def test_reassigned_record(self, deployment):
+        deployment.verified = {"file_transfer": True, "network_connectivity": False}
+        assert ai_context.get_deployment_info()["operational"] is False
+        deployment.verified = {"file_transfer": True}
+        assert ai_context.get_deployment_info()["operational"] is True
+
+    def test_item_write(self, deployment):
+        deployment.verified["logging_compliant"] = False
+        assert deployment.operational is False
+        del deployment.verified["logging_compliant"]
+        assert deployment.operational is True
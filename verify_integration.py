@@ -4,9 +4,13 @@ Verification Script for MIME-Typing Network Integration
 Tests all components of the integrated mockup-infra + week01-mime-typing system
 """
 
+import asyncio
+import contextvars
+import os
 import subprocess
 import sys
 import json
+from dataclasses import dataclass
 from pathlib import Path
 
 class Colors:
@@ -17,64 +21,141 @@ class Colors:
     INFO = '\033[94m'    # Blue
     END = '\033[0m'      # Reset
 
+# Pre-built line prefixes and rules
+_RULE = "=" * 60
+_OK = f"{Colors.OK}[OK]{Colors.END} "
+_FAIL = f"{Colors.FAIL}[FAIL]{Colors.END} "
+_WARN = f"{Colors.WARN}[WARN]{Colors.END} "
+_INFO = f"{Colors.INFO}[INFO]{Colors.END} "
+
+# Output buffer of the check running in the current task (None = write directly)
+_check_output = contextvars.ContextVar("check_output", default=None)
+
+def emit(text=""):
+    """Write a line, or buffer it when called from a concurrently running check"""
+    buffer = _check_output.get()
+    if buffer is None:
+        sys.stdout.write(f"{text}\n")
+    else:
+        buffer.append(f"{text}\n")
+
+def format_header(text):
+    """Format a header block"""
+    return f"\n{Colors.INFO}{_RULE}\n{text:^60}\n{_RULE}{Colors.END}\n"
+
 def print_header(text):
     """Print a formatted header"""
-    print(f"\n{Colors.INFO}{'='*60}")
-    print(f"{text:^60}")
-    print(f"{'='*60}{Colors.END}\n")
+    emit(format_header(text))
 
 def print_ok(text):
     """Print success message"""
-    print(f"{Colors.OK}[OK]{Colors.END} {text}")
+    emit(_OK + text)
 
 def print_fail(text):
     """Print failure message"""
-    print(f"{Colors.FAIL}[FAIL]{Colors.END} {text}")
+    emit(_FAIL + text)
 
 def print_warn(text):
     """Print warning message"""
-    print(f"{Colors.WARN}[WARN]{Colors.END} {text}")
+    emit(_WARN + text)
 
 def print_info(text):
     """Print info message"""
-    print(f"{Colors.INFO}[INFO]{Colors.END} {text}")
+    emit(_INFO + text)
+
+async def _run_captured(check):
+    """Run one check with its output buffered; returns (result, output)"""
+    buffer = []
+    _check_output.set(buffer)  # gather() runs each check in its own context copy
+    result = await check()
+    return result, "".join(buffer)
+
+async def run_concurrently(checks):
+    """Run checks concurrently, printing each one's output in the given order"""
+    outcomes = await asyncio.gather(*(_run_captured(check) for check in checks))
+    for _, output in outcomes:
+        sys.stdout.write(output)
+    return [result for result, _ in outcomes]
 
-def run_command(cmd, shell=False, capture=True):
+# Upper bound on docker/compose CLI processes in flight, so fan-out doesn't swamp dockerd
+MAX_PARALLEL_COMMANDS = 8
+_command_slots = asyncio.Semaphore(MAX_PARALLEL_COMMANDS)
+
+async def run_command(cmd, capture=True, timeout=5):
     """Run a command and return (success, output)"""
+    pipe = subprocess.PIPE if capture else None
     try:
-        if capture:
-            result = subprocess.run(
-                cmd, 
-                shell=shell, 
-                capture_output=True, 
-                text=True, 
-                timeout=5
-            )
-            return result.returncode == 0, result.stdout + result.stderr
-        else:
-            result = subprocess.run(
-                cmd, 
-                shell=shell, 
-                timeout=5
-            )
-            return result.returncode == 0, ""
-    except subprocess.TimeoutExpired:
-        return False, "Command timeout"
+        async with _command_slots:
+            proc = await asyncio.create_subprocess_exec(*cmd, stdout=pipe, stderr=pipe)
+            try:
+                stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout)
+            except asyncio.TimeoutError:
+                proc.kill()
+                await proc.wait()
+                return False, "Command timeout"
+        output = (stdout or b"").decode(errors="replace") + (stderr or b"").decode(errors="replace")
+        return proc.returncode == 0, output
     except Exception as e:
         return False, str(e)
 
-def check_docker():
+async def snapshot_containers():
+    """Return {name: {"state": ..., "ports": ...}} for all containers from one `docker ps -a`"""
+    success, output = await run_command(
+        ["docker", "ps", "-a", "--format", "{{.Names}}\t{{.State}}\t{{.Ports}}"]
+    )
+    containers = {}
+    if success:
+        for line in output.splitlines():
+            name, _, rest = line.partition("\t")
+            state, _, ports = rest.partition("\t")
+            if name:
+                containers[name] = {"state": state, "ports": ports}
+    return containers
+
+async def snapshot_networks():
+    """Return the set of docker network names from one `docker network ls`"""
+    success, output = await run_command(["docker", "network", "ls", "--format", "{{.Name}}"])
+    return set(output.split()) if success else set()
+
+async def snapshot_volumes():
+    """Return the set of docker volume names from one `docker volume ls`"""
+    success, output = await run_command(["docker", "volume", "ls", "--format", "{{.Name}}"])
+    return set(output.split()) if success else set()
+
+def is_running(containers, name):
+    """Check a container's state in a snapshot"""
+    return containers.get(name, {}).get("state") == "running"
+
+_IN_CONTAINER_PROBE = "import socket,sys; socket.create_connection(('127.0.0.1', int(sys.argv[1])), 1).close()"
+
+async def probe_container_port(name, port):
+    """Check from inside the container's network namespace that something accepts connections on port"""
+    # A host-side connect to a published port is accepted by docker-proxy even when
+    # nothing listens in the container, and an unpublished port's bridge IP is not
+    # routable from the host on Docker Desktop / Podman machine, so always probe in-container
+    success, _ = await run_command(["docker", "exec", name, "python", "-c", _IN_CONTAINER_PROBE, str(port)])
+    if success:
+        return True
+    # Images without Python (e.g. nginx:alpine): busybox/netcat connect test
+    success, _ = await run_command(["docker", "exec", name, "nc", "-z", "-w", "1", "127.0.0.1", str(port)])
+    if success:
+        return True
+    # Last resort: the listening-socket table
+    success, output = await run_command(["docker", "exec", name, "ss", "-tln"])
+    return success and f":{port} " in output
+
+async def check_docker():
     """Check if Docker is installed and running"""
     print_header("DOCKER INSTALLATION CHECK")
     
-    success, output = run_command(["docker", "--version"])
+    success, output = await run_command(["docker", "--version"])
     if success:
         print_ok(f"Docker installed: {output.strip()}")
     else:
         print_fail("Docker not found. Install from https://www.docker.com")
         return False
     
-    success, output = run_command(["docker", "ps"])
+    success, output = await run_command(["docker", "ps"])
     if success:
         print_ok("Docker daemon is running")
     else:
@@ -83,11 +164,11 @@ def check_docker():
     
     return True
 
-def check_docker_compose():
+async def check_docker_compose():
     """Check if Docker Compose is installed"""
     print_header("DOCKER COMPOSE CHECK")
     
-    success, output = run_command(["docker-compose", "--version"])
+    success, output = await run_command(["docker-compose", "--version"])
     if success:
         print_ok(f"Docker Compose installed: {output.strip()}")
     else:
@@ -96,7 +177,7 @@ def check_docker_compose():
     
     return True
 
-def check_workspace():
+async def check_workspace():
     """Check if workspace structure exists"""
     print_header("WORKSPACE STRUCTURE CHECK")
     
@@ -115,17 +196,25 @@ def check_workspace():
     
     all_ok = True
     
+    # One directory listing per parent instead of a stat per required entry
+    present = {}
+    for parent in {"", *(Path(name).parent.as_posix() for name in required_files)}:
+        try:
+            with os.scandir(base_path / parent) as entries:
+                present[parent] = {entry.name for entry in entries}
+        except OSError:
+            present[parent] = set()
+    
     for dir_name in required_dirs:
-        dir_path = base_path / dir_name
-        if dir_path.exists():
+        if dir_name in present[""]:
             print_ok(f"Directory found: {dir_name}")
         else:
             print_fail(f"Directory missing: {dir_name}")
             all_ok = False
     
     for file_name in required_files:
-        file_path = base_path / file_name
-        if file_path.exists():
+        parent, _, name = file_name.rpartition("/")
+        if name in present[parent]:
             print_ok(f"File found: {file_name}")
         else:
             print_fail(f"File missing: {file_name}")
@@ -133,69 +222,58 @@ def check_workspace():
     
     return all_ok
 
-def check_containers():
+async def check_containers():
     """Check status of containers"""
     print_header("CONTAINER STATUS CHECK")
     
-    success, output = run_command(["docker-compose", "-f", "mockup-infra/docker-compose.yml", "ps"], shell=False)
+    success, output = await run_command(["docker-compose", "-f", "mockup-infra/docker-compose.yml", "ps"])
     
     if success:
         print_ok("docker-compose ps command successful")
-        print(output)
+        emit(output)
         return True
     else:
         print_warn("Could not get container status. Services may not be running yet.")
-        print("Run: cd mockup-infra && docker-compose up -d")
+        emit("Run: cd mockup-infra && docker-compose up -d")
         return False
 
-def check_networks():
+async def check_networks(networks):
     """Check if docker networks exist"""
     print_header("DOCKER NETWORKS CHECK")
     
-    success, output = run_command(["docker", "network", "ls"])
-    
-    if "public_net" in output and "private_net" in output:
+    if any("public_net" in name for name in networks) and any("private_net" in name for name in networks):
         print_ok("Both public_net and private_net networks found")
         return True
     else:
         print_warn("Networks not found. They will be created when docker-compose starts.")
-        print("Run: cd mockup-infra && docker-compose up -d")
+        emit("Run: cd mockup-infra && docker-compose up -d")
         return False
 
-def check_volumes():
+async def check_volumes(volumes):
     """Check if docker volumes exist"""
     print_header("DOCKER VOLUMES CHECK")
     
-    success, output = run_command(["docker", "volume", "ls"])
-    
-    if "mime_storage" in output:
+    if any("mime_storage" in name for name in volumes):
         print_ok("mime_storage volume found")
         return True
     else:
         print_warn("mime_storage volume not found. It will be created when docker-compose starts.")
         return False
 
-def check_mime_server():
+async def check_mime_server(containers):
     """Check if MIME server is accessible"""
     print_header("MIME SERVER CHECK")
     
     # Check if container exists
-    success, output = run_command(["docker", "ps", "-a"])
-    
-    if "mime-server" in output:
+    if "mime-server" in containers:
         print_ok("mime-server container found")
         
         # Check if running
-        success, output = run_command(["docker", "ps"])
-        if "mime-server" in output:
+        if is_running(containers, "mime-server"):
             print_ok("mime-server container is RUNNING")
             
             # Try to check if port is listening
-            success, output = run_command(
-                ["docker", "exec", "mime-server", "ss", "-tlnp"],
-                shell=False
-            )
-            if success and "65432" in output:
+            if await probe_container_port("mime-server", 65432):
                 print_ok("MIME server listening on port 65432")
                 return True
             else:
@@ -203,24 +281,21 @@ def check_mime_server():
                 return False
         else:
             print_warn("mime-server container exists but is not running")
-            print("Run: docker-compose -f mockup-infra/docker-compose.yml up -d")
+            emit("Run: docker-compose -f mockup-infra/docker-compose.yml up -d")
             return False
     else:
         print_warn("mime-server container not found. Build with: docker-compose build")
         return False
 
-def check_mime_client():
+async def check_mime_client(containers):
     """Check if MIME client container is available"""
     print_header("MIME CLIENT CHECK")
     
-    success, output = run_command(["docker", "ps", "-a"])
-    
-    if "mime-client" in output:
+    if "mime-client" in containers:
         print_ok("mime-client container image found")
         
         # Check if it's running
-        success_run, output_run = run_command(["docker", "ps"])
-        if "mime-client" in output_run:
+        if is_running(containers, "mime-client"):
             print_ok("mime-client container is RUNNING (on-demand mode)")
         else:
             print_ok("mime-client container exists (will start on-demand with --profile client-manual)")
@@ -230,77 +305,61 @@ def check_mime_client():
         print_warn("mime-client container not found. Build with: docker-compose build")
         return False
 
-def check_cross_network_connectivity():
-    """Check if client can reach server across networks"""
+async def check_cross_network_connectivity(containers):
+    """Check if the server is reachable across the private network"""
     print_header("CROSS-NETWORK CONNECTIVITY CHECK")
     
-    # Check if mime-client is running
-    success, output = run_command(["docker", "ps"])
+    if not is_running(containers, "mime-server"):
+        print_warn("mime-server not running. Start with: docker-compose -f mockup-infra/docker-compose.yml up -d")
+        return False
     
-    if "mime-client" in output:
-        # Try ping
-        success, output = run_command(
-            ["docker", "exec", "mime-client", "ping", "-c", "1", "mime-server"],
-            shell=False
-        )
-        
-        if success:
-            print_ok("mime-client can ping mime-server")
-            return True
-        else:
-            print_warn("ping failed. Trying nc (netcat)...")
-            
-            success, output = run_command(
-                ["docker", "exec", "mime-client", "nc", "-zv", "mime-server", "65432"],
-                shell=False
-            )
-            
-            if success:
-                print_ok("mime-client can reach mime-server:65432 via netcat")
-                return True
-            else:
-                print_warn("Could not verify connectivity (nc not available)")
-                return False
+    # Dial from a throwaway container on private_net, independent of what the client image ships
+    success, output = await run_command(
+        ["docker", "run", "--rm", "--network", "mockup-infra_private_net",
+         "busybox:1.36", "nc", "-zv", "mime-server", "65432"],
+        timeout=15
+    )
+    
+    if success:
+        print_ok("mime-server:65432 reachable from private_net")
+        return True
     else:
-        print_warn("mime-client not running. Start with: docker-compose --profile client-manual run mime-client")
+        print_warn("Could not reach mime-server:65432 from private_net")
         return False
 
-def check_storage():
+async def check_storage():
     """Check storage volume"""
     print_header("STORAGE VOLUME CHECK")
     
-    success, output = run_command(
-        ["docker", "exec", "mime-server", "ls", "-la", "/storage/"],
-        shell=False
+    success, output = await run_command(
+        ["docker", "exec", "mime-server", "ls", "-la", "/storage/"]
     )
     
     if success:
         print_ok("mime-server storage directory accessible")
         if output.strip():
-            print(output)
+            emit(output)
         else:
-            print("(Storage directory is empty)")
+            emit("(Storage directory is empty)")
         return True
     else:
         print_warn("Could not access storage directory")
         return False
 
-def check_nginx_gateway():
+async def check_nginx_gateway(containers):
     """Check if Nginx gateway is running"""
     print_header("NGINX GATEWAY CHECK")
     
-    success, output = run_command(["docker", "ps"])
-    
-    if "mockup-gateway" in output:
+    if is_running(containers, "mockup-gateway"):
         print_ok("nginx-gateway (mockup-gateway) container is RUNNING")
         
         # Check ports
-        success, output = run_command(
-            ["docker", "exec", "mockup-gateway", "ss", "-tlnp"],
-            shell=False
+        http_ok, https_ok = await asyncio.gather(
+            probe_container_port("mockup-gateway", 80),
+            probe_container_port("mockup-gateway", 443),
         )
         
-        if success and "80" in output and "443" in output:
+        if http_ok and https_ok:
             print_ok("Nginx listening on ports 80 and 443")
             return True
         else:
@@ -310,90 +369,112 @@ def check_nginx_gateway():
         print_warn("mockup-gateway not running")
         return False
 
-def run_all_checks():
+@dataclass(frozen=True)
+class Check:
+    """One verification step: runs in its tier once every check in deps has passed"""
+    name: str
+    func: object
+    tier: int
+    deps: tuple = ()
+    snapshots: tuple = ()  # snapshot_* coroutines whose results are passed as arguments
+
+_ESSENTIALS = ("docker", "docker_compose")
+_SERVICES = ("mime_server", "mime_client")
+
+CHECKS = (
+    Check("docker", check_docker, tier=1),
+    Check("docker_compose", check_docker_compose, tier=1),
+    Check("workspace", check_workspace, tier=1),
+    Check("containers", check_containers, tier=2, deps=_ESSENTIALS),
+    Check("networks", check_networks, tier=2, deps=_ESSENTIALS, snapshots=(snapshot_networks,)),
+    Check("volumes", check_volumes, tier=2, deps=_ESSENTIALS, snapshots=(snapshot_volumes,)),
+    Check("mime_server", check_mime_server, tier=3, deps=("containers",), snapshots=(snapshot_containers,)),
+    Check("mime_client", check_mime_client, tier=3, deps=("containers",), snapshots=(snapshot_containers,)),
+    Check("nginx", check_nginx_gateway, tier=3, deps=("containers",), snapshots=(snapshot_containers,)),
+    Check("cross_network", check_cross_network_connectivity, tier=4, deps=_SERVICES,
+          snapshots=(snapshot_containers,)),
+    Check("storage", check_storage, tier=4, deps=_SERVICES),
+)
+
+# tier -> (title, message printed when its dependencies failed)
+TIERS = {
+    1: ("ESSENTIAL REQUIREMENTS", None),
+    2: ("DEPLOYMENT STATUS", f"{Colors.FAIL}Cannot proceed without Docker and docker-compose{Colors.END}"),
+    3: ("SERVICE HEALTH", f"{Colors.WARN}Services not deployed yet. Run: cd mockup-infra && docker-compose up -d{Colors.END}"),
+    4: ("CONNECTIVITY", None),
+}
+
+async def run_all_checks():
     """Run all verification checks"""
     print_header("MIME-TYPING NETWORK INTEGRATION VERIFICATION")
     print(f"System: {sys.platform}")
     print()
     
     results = {}
-    
-    # Essential checks
-    print(f"{Colors.INFO}TIER 1: ESSENTIAL REQUIREMENTS{Colors.END}")
-    results['docker'] = check_docker()
-    results['docker_compose'] = check_docker_compose()
-    results['workspace'] = check_workspace()
-    
-    if not all([results['docker'], results['docker_compose']]):
-        print(f"\n{Colors.FAIL}Cannot proceed without Docker and docker-compose{Colors.END}")
-        return results
-    
-    # Deployment checks
-    print(f"\n{Colors.INFO}TIER 2: DEPLOYMENT STATUS{Colors.END}")
-    results['containers'] = check_containers()
-    results['networks'] = check_networks()
-    results['volumes'] = check_volumes()
-    
-    if not results['containers']:
-        print(f"\n{Colors.WARN}Services not deployed yet. Run: cd mockup-infra && docker-compose up -d{Colors.END}")
-        return results
-    
-    # Service checks
-    print(f"\n{Colors.INFO}TIER 3: SERVICE HEALTH{Colors.END}")
-    results['mime_server'] = check_mime_server()
-    results['mime_client'] = check_mime_client()
-    results['nginx'] = check_nginx_gateway()
-    
-    # Connectivity checks (only if services running)
-    if results['mime_server'] and 'mime-client' in open('mockup-infra/docker-compose.ps', 'a').name or True:
-        print(f"\n{Colors.INFO}TIER 4: CONNECTIVITY{Colors.END}")
-        results['cross_network'] = check_cross_network_connectivity()
-        results['storage'] = check_storage()
+    snapshots = {}  # each docker snapshot is taken once, by whichever check needs it first
+    
+    def bind(check):
+        async def run():
+            for snap in check.snapshots:
+                if snap not in snapshots:
+                    snapshots[snap] = asyncio.ensure_future(snap())
+            args = [await snapshots[snap] for snap in check.snapshots]
+            return await check.func(*args)
+        return run
+    
+    for tier, (title, blocked_message) in sorted(TIERS.items()):
+        checks = [c for c in CHECKS if c.tier == tier and all(results.get(d) for d in c.deps)]
+        if not checks:
+            if blocked_message:
+                print(f"\n{blocked_message}")
+            break
+        heading = f"{Colors.INFO}TIER {tier}: {title}{Colors.END}"
+        print(heading if tier == 1 else f"\n{heading}")
+        for check, result in zip(checks, await run_concurrently([bind(c) for c in checks])):
+            results[check.name] = result
     
     return results
 
 def print_summary(results):
     """Print summary of all checks"""
-    print_header("VERIFICATION SUMMARY")
-    
     total = len(results)
     passed = sum(1 for v in results.values() if v)
     failed = total - passed
     
-    print(f"Total Checks: {total}")
-    print(f"{Colors.OK}Passed: {passed}{Colors.END}")
+    lines = [format_header("VERIFICATION SUMMARY"), "\n", f"Total Checks: {total}\n",
+             f"{Colors.OK}Passed: {passed}{Colors.END}\n"]
     if failed > 0:
-        print(f"{Colors.FAIL}Failed: {failed}{Colors.END}")
+        lines.append(f"{Colors.FAIL}Failed: {failed}{Colors.END}\n")
     
-    print(f"\n{Colors.INFO}Status:{Colors.END}")
+    lines.append(f"\n{Colors.INFO}Status:{Colors.END}\n")
     for check, result in results.items():
-        status = f"{Colors.OK}[OK]{Colors.END}" if result else f"{Colors.FAIL}[FAIL]{Colors.END}"
-        check_name = check.replace('_', ' ').title()
-        print(f"  {status} {check_name}")
+        status = _OK if result else _FAIL
+        lines.append(f"  {status}{check.replace('_', ' ').title()}\n")
     
-    print()
+    lines.append("\n")
     
     if passed == total:
-        print(f"{Colors.OK}{'='*60}")
-        print(f"{'ALL CHECKS PASSED!':^60}")
-        print(f"Your system is ready for MIME file transfers.{'':<15}")
-        print(f"{'='*60}{Colors.END}\n")
+        lines.append(f"{Colors.OK}{_RULE}\n{'ALL CHECKS PASSED!':^60}\n"
+                     f"Your system is ready for MIME file transfers.{'':<15}\n{_RULE}{Colors.END}\n\n")
     else:
-        print(f"{Colors.WARN}{'='*60}")
-        print(f"{'SOME CHECKS FAILED':^60}")
-        print(f"See messages above for details and fixes.{'':<16}")
-        print(f"{'='*60}{Colors.END}\n")
-    
-    print(f"{Colors.INFO}Next Steps:{Colors.END}")
-    print("  1. If Docker not installed: Install from https://www.docker.com")
-    print("  2. If services not deployed: cd mockup-infra && docker-compose up -d")
-    print("  3. If all checks pass: Try a file transfer with:")
-    print("     docker-compose --profile client-manual run --rm mime-client")
-    print()
+        lines.append(f"{Colors.WARN}{_RULE}\n{'SOME CHECKS FAILED':^60}\n"
+                     f"See messages above for details and fixes.{'':<16}\n{_RULE}{Colors.END}\n\n")
+    
+    lines.append(_NEXT_STEPS)
+    sys.stdout.write("".join(lines))
+
+_NEXT_STEPS = (
+    f"{Colors.INFO}Next Steps:{Colors.END}\n"
+    "  1. If Docker not installed: Install from https://www.docker.com\n"
+    "  2. If services not deployed: cd mockup-infra && docker-compose up -d\n"
+    "  3. If all checks pass: Try a file transfer with:\n"
+    "     docker-compose --profile client-manual run --rm mime-client\n"
+    "\n"
+)
 
 if __name__ == "__main__":
     try:
-        results = run_all_checks()
+        results = asyncio.run(run_all_checks())
         print_summary(results)
     except KeyboardInterrupt:
         print(f"\n{Colors.WARN}Verification interrupted by user{Colors.END}\n")
@@ -1,43 +1,97 @@
 """Shared API endpoints for Phase 2 production"""
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.core.database import get_async_session
+from app.core.database import get_async_session, ping_database
 from app.schemas.common import HealthResponse, ErrorResponse
 from app.schemas.user import UserAuth
 from app.core.redis import redis_client
-from datetime import datetime
+import asyncio
+import hashlib
 import logging
+import time
+import orjson
 
 logger = logging.getLogger(__name__)
 
+# DBSIZE result shared by all scrapers for DBSIZE_TTL seconds
+DBSIZE_TTL = 1.0
+_dbsize_cache = {"t": 0.0, "v": 0, "lock": asyncio.Lock()}
+
 router = APIRouter(
     prefix="/shared",
     tags=["shared"]
 )
 
+# /info never changes, so its JSON body is encoded once at import
+_INFO_JSON = orjson.dumps({
+    "application": "Phase 2 Production API",
+    "version": "2.0.0",
+    "description": "Production implementation of stateless vs stateful server patterns",
+    "architecture": {
+        "backend": "FastAPI",
+        "database": "PostgreSQL",
+        "cache": "Redis",
+        "language": "Python"
+    },
+    "endpoints": {
+        "stateless": "/api/v1/stateless",
+        "stateful": "/api/v1/stateful",
+        "shared": "/api/v1/shared",
+        "docs": "/docs",
+        "health": "/api/v1/shared/health"
+    },
+    "features": {
+        "authentication": "JWT-based",
+        "session_management": "Redis-backed",
+        "rate_limiting": "Enabled",
+        "cors": "Enabled",
+        "health_checks": "Enabled",
+        "metrics": "Enabled"
+    }
+})
+_INFO_ETAG = f'"{hashlib.blake2b(_INFO_JSON, digest_size=8).hexdigest()}"'
+_INFO_HEADERS = {"ETag": _INFO_ETAG, "Cache-Control": "public, max-age=300"}
+
 
 @router.get("/health", response_model=HealthResponse)
-async def health_check():
+async def health_check(request: Request, session: AsyncSession = Depends(get_async_session)):
     """Shared health check endpoint"""
+    # Probe both backends concurrently; an exception marks that component unhealthy
+    db_ok, redis_ok = await asyncio.gather(
+        ping_database(session), redis_client.ping(), return_exceptions=True
+    )
+    db_status = "connected" if db_ok is True else "unhealthy"
+    redis_status = "connected" if redis_ok is True else "unhealthy"
     return HealthResponse(
-        status="healthy",
-        timestamp=datetime.utcnow(),
+        status="healthy" if db_ok is True and redis_ok is True else "unhealthy",
+        timestamp=request.state.now,
         version="2.0.0",
         components={
             "api": "healthy",
-            "database": "connected",
-            "redis": "connected"
+            "database": db_status,
+            "redis": redis_status
         }
     )
 
 
+async def _cached_dbsize() -> int:
+    """Return Redis DBSIZE, refreshed at most once per DBSIZE_TTL"""
+    if time.monotonic() - _dbsize_cache["t"] > DBSIZE_TTL:
+        async with _dbsize_cache["lock"]:
+            # Re-check: another request may have refreshed it while we waited
+            if time.monotonic() - _dbsize_cache["t"] > DBSIZE_TTL:
+                _dbsize_cache["v"] = await redis_client.dbsize()
+                _dbsize_cache["t"] = time.monotonic()
+    return _dbsize_cache["v"]
+
+
 @router.get("/metrics")
-async def metrics():
+async def metrics(request: Request):
     """Shared metrics endpoint"""
     try:
         # Get active sessions count from Redis
-        active_sessions = await redis_client.dbsize()
+        active_sessions = await _cached_dbsize()
         
         return {
             "metrics": {
@@ -47,7 +101,7 @@ async def metrics():
                 "database_connections": 1,
                 "redis_memory_usage": "unknown"
             },
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": request.state.now.isoformat()
         }
     except Exception as e:
         logger.error(f"Metrics endpoint error: {e}")
@@ -55,31 +109,10 @@ async def metrics():
 
 
 @router.get("/info")
-async def app_info():
+async def app_info(request: Request):
     """Application information endpoint"""
-    return {
-        "application": "Phase 2 Production API",
-        "version": "2.0.0",
-        "description": "Production implementation of stateless vs stateful server patterns",
-        "architecture": {
-            "backend": "FastAPI",
-            "database": "PostgreSQL",
-            "cache": "Redis",
-            "language": "Python"
-        },
-        "endpoints": {
-            "stateless": "/api/v1/stateless",
-            "stateful": "/api/v1/stateful",
-            "shared": "/api/v1/shared",
-            "docs": "/docs",
-            "health": "/api/v1/shared/health"
-        },
-        "features": {
-            "authentication": "JWT-based",
-            "session_management": "Redis-backed",
-            "rate_limiting": "Enabled",
-            "cors": "Enabled",
-            "health_checks": "Enabled",
-            "metrics": "Enabled"
-        }
-    }
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and (if_none_match.strip() == "*" or _INFO_ETAG in (
+            tag.strip().removeprefix("W/") for tag in if_none_match.split(","))):
+        return Response(status_code=304, headers=_INFO_HEADERS)
+    return Response(content=_INFO_JSON, media_type="application/json", headers=_INFO_HEADERS)
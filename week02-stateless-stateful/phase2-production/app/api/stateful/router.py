@@ -1,17 +1,21 @@
 """Stateful API endpoints for Phase 2 production"""
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.core.database import get_async_session
-from app.core.redis import set_session, get_session, delete_session, extend_session
+from app.core.database import get_async_session, ping_database
+from app.core.redis import (
+    redis_client, set_session, get_session, get_and_extend_session, delete_session, extend_session,
+    update_session_atomic, add_to_cart_atomic,
+)
 from app.models.user import User
 from app.models.product import Product
 from app.schemas.common import HealthResponse
 from app.schemas.session import SessionCreate, SessionResponse, SessionUpdate
 from app.schemas.user import UserResponse
 from app.schemas.product import ProductResponse
-from datetime import datetime, timedelta
-import uuid
+from datetime import timedelta
+import asyncio
+import secrets
 import logging
 
 logger = logging.getLogger(__name__)
@@ -22,36 +26,51 @@ router = APIRouter(
 )
 
 
+def _cart_items(cart) -> list:
+    """Expand a {product_id: quantity} cart into the list shape used in responses"""
+    if isinstance(cart, list):  # sessions written before the cart became a map
+        return cart
+    return [{"product_id": int(k), "quantity": v} for k, v in cart.items()]
+
+
 @router.get("/health", response_model=HealthResponse)
-async def health_check():
+async def health_check(request: Request, session: AsyncSession = Depends(get_async_session)):
     """Stateful server health check"""
+    # Probe both backends concurrently; an exception marks that component unhealthy
+    db_ok, redis_ok = await asyncio.gather(
+        ping_database(session), redis_client.ping(), return_exceptions=True
+    )
+    db_status = "connected" if db_ok is True else "unhealthy"
+    redis_status = "connected" if redis_ok is True else "unhealthy"
     return HealthResponse(
-        status="healthy",
-        timestamp=datetime.utcnow(),
+        status="healthy" if db_ok is True and redis_ok is True else "unhealthy",
+        timestamp=request.state.now,
         version="2.0.0",
         components={
             "api": "healthy",
-            "database": "connected",
-            "redis": "connected",
+            "database": db_status,
+            "redis": redis_status,
             "stateful_mode": "enabled"
         }
     )
 
 
 @router.post("/sessions", response_model=SessionResponse)
-async def create_session(user_id: int):
+async def create_session(request: Request, user_id: int):
     """Create new session"""
     try:
-        session_id = str(uuid.uuid4())
+        session_id = secrets.token_hex(16)
+        now = request.state.now
+        now_iso = now.isoformat()
         session_data = {
             "id": session_id,
             "user_id": user_id,
             "session_data": {},
             "visit_count": 1,
             "is_active": True,
-            "expires_at": (datetime.utcnow() + timedelta(hours=1)).isoformat(),
-            "created_at": datetime.utcnow().isoformat(),
-            "updated_at": datetime.utcnow().isoformat()
+            "expires_at": (now + timedelta(hours=1)).isoformat(),
+            "created_at": now_iso,
+            "updated_at": now_iso
         }
         
         success = await set_session(session_id, session_data)
@@ -69,7 +88,7 @@ async def create_session(user_id: int):
 async def get_session_by_id(session_id: str):
     """Get session by ID"""
     try:
-        session_data = await get_session(session_id)
+        session_data = await get_and_extend_session(session_id)
         if not session_data:
             raise HTTPException(status_code=404, detail="Session not found")
         
@@ -83,26 +102,18 @@ async def get_session_by_id(session_id: str):
 
 
 @router.put("/sessions/{session_id}", response_model=SessionResponse)
-async def update_session(session_id: str, update_data: SessionUpdate):
+async def update_session(request: Request, session_id: str, update_data: SessionUpdate):
     """Update session data"""
     try:
-        session_data = await get_session(session_id)
+        session_data = await update_session_atomic(
+            session_id,
+            request.state.now.isoformat(),
+            session_data=update_data.session_data,
+            is_active=update_data.is_active,
+        )
         if not session_data:
             raise HTTPException(status_code=404, detail="Session not found")
         
-        # Update session data
-        if update_data.session_data is not None:
-            session_data["session_data"].update(update_data.session_data)
-        if update_data.is_active is not None:
-            session_data["is_active"] = update_data.is_active
-        
-        session_data["updated_at"] = datetime.utcnow().isoformat()
-        session_data["visit_count"] += 1
-        
-        success = await set_session(session_id, session_data)
-        if not success:
-            raise HTTPException(status_code=500, detail="Failed to update session")
-        
         return SessionResponse(**session_data)
         
     except HTTPException:
@@ -130,31 +141,16 @@ async def delete_session_by_id(session_id: str):
 
 
 @router.post("/cart/{session_id}")
-async def add_to_cart(session_id: str, product_id: int, quantity: int = 1):
+async def add_to_cart(request: Request, session_id: str, product_id: int, quantity: int = 1):
     """Add item to shopping cart"""
     try:
-        session_data = await get_session(session_id)
+        session_data = await add_to_cart_atomic(
+            session_id, product_id, quantity, request.state.now.isoformat()
+        )
         if not session_data:
             raise HTTPException(status_code=404, detail="Session not found")
         
-        # Get cart from session data
-        cart = session_data["session_data"].get("cart", [])
-        
-        # Check if product already in cart
-        for item in cart:
-            if item["product_id"] == product_id:
-                item["quantity"] += quantity
-                break
-        else:
-            cart.append({"product_id": product_id, "quantity": quantity})
-        
-        session_data["session_data"]["cart"] = cart
-        session_data["updated_at"] = datetime.utcnow().isoformat()
-        
-        success = await set_session(session_id, session_data)
-        if not success:
-            raise HTTPException(status_code=500, detail="Failed to update cart")
-        
+        cart = _cart_items(session_data["session_data"]["cart"])
         return {"message": "Item added to cart", "cart": cart}
         
     except HTTPException:
@@ -172,7 +168,7 @@ async def get_cart(session_id: str):
         if not session_data:
             raise HTTPException(status_code=404, detail="Session not found")
         
-        cart = session_data["session_data"].get("cart", [])
+        cart = _cart_items(session_data["session_data"].get("cart", {}))
         return {"cart": cart, "session_id": session_id}
         
     except HTTPException:
@@ -0,0 +1,25 @@
+"""Numba kernel for assembling random strings in the /random endpoint"""
+
+from numba import njit
+import numpy as np
+
+CHAR_CODES = np.frombuffer(b"abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789", dtype=np.uint8)
+
+
+@njit(cache=True)
+def sample_strings(draws, lengths, chars):
+    """Pack row i's first lengths[i] sampled chars into one newline-separated buffer"""
+    out = np.empty(lengths.sum() + lengths.shape[0] - 1, np.uint8)
+    pos = 0
+    for i in range(lengths.shape[0]):
+        if i:
+            out[pos] = 10  # "\n"
+            pos += 1
+        for j in range(lengths[i]):
+            out[pos] = chars[draws[i, j]]
+            pos += 1
+    return out
+
+
+# Compile at import so the first request doesn't pay the JIT cost
+sample_strings(np.zeros((1, 1), np.int64), np.ones(1, np.int64), CHAR_CODES)
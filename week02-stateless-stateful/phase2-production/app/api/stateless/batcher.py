@@ -0,0 +1,95 @@
+"""Request coalescing for stateless list queries"""
+
+from sqlalchemy import select, literal, func, union_all
+from app.core.database import SessionScoped
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+# How long the first query of a batch waits for others to join it, and the batch cap
+BATCH_WINDOW = 0.003
+MAX_BATCH = 32
+
+
+class QueryBatcher:
+    """Collects concurrent column queries on one model and runs them as a single UNION ALL"""
+
+    def __init__(self, model, order_by, window: float = BATCH_WINDOW, max_batch: int = MAX_BATCH):
+        self.model = model
+        self.order_by = tuple(order_by)
+        self.window = window
+        self.max_batch = max_batch
+        self._queue = None
+        self._worker = None
+
+    async def submit(self, stmt) -> list:
+        """Queue a filtered/limited select of model columns and wait for its rows (as mappings)"""
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._run())
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((stmt, future))
+        return await future
+
+    async def _run(self):
+        """Drain the queue in windows of at most max_batch queries"""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.window
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            await self._flush(batch)
+
+    async def _flush(self, batch):
+        """Run one batch and hand each caller its slice"""
+        try:
+            results = await self._execute([stmt for stmt, _ in batch])
+        except Exception as e:
+            logger.error(f"Batched {self.model.__name__} query failed: {e}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), rows in zip(batch, results):
+            if not future.done():
+                future.set_result(rows)
+
+    async def _execute(self, stmts) -> list:
+        """Execute the statements in one round-trip; returns one row list per statement"""
+        # The worker task's scoped session; removed after each batch to release the connection
+        session = SessionScoped()
+        try:
+            if len(stmts) == 1:
+                result = await session.execute(stmts[0].order_by(*self.order_by))
+                return [result.mappings().all()]
+
+            # Tag each query's rows with its slot and position, then split them back apart
+            parts = [
+                select(
+                    stmt.order_by(*self.order_by).add_columns(
+                        literal(slot).label("batch_slot"),
+                        func.row_number().over(order_by=self.order_by).label("batch_pos"),
+                    ).subquery()
+                )
+                for slot, stmt in enumerate(stmts)
+            ]
+            combined = union_all(*parts).subquery()
+            columns = [c for c in combined.c if c.name not in ("batch_slot", "batch_pos")]
+            result = await session.execute(
+                select(combined.c.batch_slot, *columns)
+                .order_by(combined.c.batch_slot, combined.c.batch_pos)
+            )
+            grouped = [[] for _ in stmts]
+            for slot, *values in result.all():
+                grouped[slot].append(dict(zip((c.name for c in columns), values)))
+            return grouped
+        finally:
+            await SessionScoped.remove()
@@ -1,92 +1,144 @@
 """Stateless API endpoints for Phase 2 production"""
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
-from app.core.database import get_async_session
+from sqlalchemy import select, func, tuple_
 from app.models.user import User
 from app.models.product import Product
 from app.schemas.common import HealthResponse, ErrorResponse, CalculationRequest, CalculationResponse, RandomDataRequest, RandomDataResponse
-from app.schemas.user import UserResponse
-from app.schemas.product import ProductResponse, ProductSearch
-from datetime import datetime
-import random
+from app.schemas.user import UserResponse, UserPage
+from app.schemas.product import ProductSearch, ProductSummary, ProductPage
+from app.api.stateless.batcher import QueryBatcher
+from app.api.stateless._rand_kernel import CHAR_CODES, sample_strings
+from app.core.cache import cached_json_bytes
+from typing import Optional
+import numpy as np
+import orjson
+import operator
+import os
+import uuid
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Vectorised random generation: one NumPy call per request instead of a per-item loop
+_RNG = np.random.default_rng()
+_MIN_STRING_LENGTH, _MAX_STRING_LENGTH = 5, 20
+
+# operation -> (function, value used when operand2 is omitted)
+_OPS = {
+    "add": (operator.add, 0),
+    "subtract": (operator.sub, 0),
+    "multiply": (operator.mul, 1),
+    "divide": (operator.truediv, None),
+}
+
 router = APIRouter(
     prefix="/stateless",
     tags=["stateless"]
 )
 
+# List responses are served from Redis for this long after a DB read
+LIST_CACHE_TTL = 30
+
+# Concurrent list requests are coalesced into one query per model
+_users_batcher = QueryBatcher(User, order_by=[User.id])
+_products_batcher = QueryBatcher(Product, order_by=[Product.name, Product.id])
+
+
+def _timestamp_template(payload: dict) -> tuple:
+    """Encode payload once and split it around its "timestamp" value into (prefix, suffix)"""
+    prefix, suffix = orjson.dumps({**payload, "timestamp": "\x00"}).split(b"\\u0000")
+    return prefix, suffix
+
+
+# /info body minus the per-request timestamp
+_STATIC_INFO = {
+    "server": "Phase 2 Stateless Server",
+    "mode": "stateless",
+    "description": "Stateless API server - no session persistence between requests",
+    "capabilities": [
+        "calculations",
+        "random_data_generation",
+        "user_data_access",
+        "product_catalog",
+        "api_documentation"
+    ],
+    "endpoints": {
+        "health": "/health",
+        "calculate": "/calculate",
+        "random": "/random",
+        "users": "/users",
+        "products": "/products"
+    },
+    "version": "2.0.0"
+}
+_INFO_PREFIX, _INFO_SUFFIX = _timestamp_template(_STATIC_INFO)
+
+# Stateless /health only varies in its timestamp; key order follows HealthResponse
+_HEALTH_PREFIX, _HEALTH_SUFFIX = _timestamp_template({
+    "status": "healthy",
+    "timestamp": None,
+    "version": "2.0.0",
+    "components": {
+        "api": "healthy",
+        "database": "connected",
+        "stateless_mode": "enabled"
+    }
+})
+
+# Columns fetched for list views; the product description is left in the table
+_USER_COLUMNS = (
+    User.id, User.name, User.email, User.preferences, User.is_active, User.created_at, User.updated_at,
+)
+_PRODUCT_COLUMNS = (
+    Product.id, Product.name, Product.category, Product.price, Product.stock,
+    Product.is_available, Product.created_at, Product.updated_at,
+)
+
 
-@router.get("/health", response_model=HealthResponse)
-async def health_check():
+# /health and /info splice the request timestamp into pre-encoded JSON
+@router.get("/health", response_model=None, responses={200: {"model": HealthResponse}})
+async def health_check(request: Request):
     """Stateless server health check"""
-    return HealthResponse(
-        status="healthy",
-        timestamp=datetime.utcnow(),
-        version="2.0.0",
-        components={
-            "api": "healthy",
-            "database": "connected",
-            "stateless_mode": "enabled"
-        }
+    return Response(
+        _HEALTH_PREFIX + request.state.now.isoformat().encode() + _HEALTH_SUFFIX,
+        media_type="application/json"
     )
 
 
 @router.get("/info")
-async def server_info():
+async def server_info(request: Request):
     """Stateless server information"""
-    return {
-        "server": "Phase 2 Stateless Server",
-        "mode": "stateless",
-        "description": "Stateless API server - no session persistence between requests",
-        "capabilities": [
-            "calculations",
-            "random_data_generation",
-            "user_data_access",
-            "product_catalog",
-            "api_documentation"
-        ],
-        "endpoints": {
-            "health": "/health",
-            "calculate": "/calculate",
-            "random": "/random",
-            "users": "/users",
-            "products": "/products"
-        },
-        "version": "2.0.0",
-        "timestamp": datetime.utcnow().isoformat()
-    }
+    return Response(
+        _INFO_PREFIX + request.state.now.isoformat().encode() + _INFO_SUFFIX,
+        media_type="application/json"
+    )
 
 
 @router.post("/calculate", response_model=CalculationResponse)
-async def calculate(request: CalculationRequest):
+async def calculate(request: CalculationRequest, http_request: Request):
     """Perform calculation operations (stateless)"""
     try:
-        if request.operation == "add":
-            result = request.operand1 + (request.operand2 or 0)
-        elif request.operation == "subtract":
-            result = request.operand1 - (request.operand2 or 0)
-        elif request.operation == "multiply":
-            result = request.operand1 * (request.operand2 or 1)
-        elif request.operation == "divide":
-            if request.operand2 == 0:
-                raise HTTPException(status_code=400, detail="Division by zero not allowed")
-            result = request.operand1 / request.operand2
-        else:
+        entry = _OPS.get(request.operation)
+        if entry is None:
             raise HTTPException(status_code=400, detail=f"Unsupported operation: {request.operation}")
+        op, default_operand2 = entry
+        operand2 = default_operand2 if request.operand2 is None else request.operand2
+        if op is operator.truediv and operand2 == 0:
+            raise HTTPException(status_code=400, detail="Division by zero not allowed")
         
-        return CalculationResponse(
+        # Fields are already validated by CalculationRequest; skip re-validation
+        return CalculationResponse.model_construct(
             operation=request.operation,
-            result=result,
+            result=op(request.operand1, operand2),
             operand1=request.operand1,
             operand2=request.operand2,
-            timestamp=datetime.utcnow()
+            timestamp=http_request.state.now
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Calculation error: {e}")
         raise HTTPException(status_code=500, detail="Calculation failed")
@@ -94,6 +146,7 @@ async def calculate(request: CalculationRequest):
 
 @router.get("/random", response_model=RandomDataResponse)
 async def generate_random_data(
+    request: Request,
     type: str = Query(..., description="Type of random data to generate"),
     count: int = Query(1, ge=1, le=100, description="Number of items to generate"),
     min_value: float = Query(None, description="Minimum value for numeric types"),
@@ -101,38 +154,32 @@ async def generate_random_data(
 ):
     """Generate random data (stateless)"""
     try:
-        data = []
-        
-        for _ in range(count):
-            if type == "number":
-                min_val = min_value or 0
-                max_val = max_value or 100
-                value = random.uniform(min_val, max_val)
-                data.append(value)
-                
-            elif type == "string":
-                length = random.randint(5, 20)
-                chars = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789"
-                value = ''.join(random.choice(chars) for _ in range(length))
-                data.append(value)
-                
-            elif type == "boolean":
-                value = random.choice([True, False])
-                data.append(value)
-                
-            elif type == "uuid":
-                import uuid
-                value = str(uuid.uuid4())
-                data.append(value)
-                
-            else:
-                raise HTTPException(status_code=400, detail=f"Unsupported data type: {type}")
+        if type == "number":
+            min_val = min_value or 0
+            max_val = max_value or 100
+            data = _RNG.uniform(min_val, max_val, count).tolist()
+            
+        elif type == "string":
+            lengths = _RNG.integers(_MIN_STRING_LENGTH, _MAX_STRING_LENGTH + 1, count)
+            draws = _RNG.integers(0, len(CHAR_CODES), (count, _MAX_STRING_LENGTH))
+            data = sample_strings(draws, lengths, CHAR_CODES).tobytes().decode().split("\n")
+            
+        elif type == "boolean":
+            data = _RNG.integers(0, 2, count).astype(bool).tolist()
+            
+        elif type == "uuid":
+            # One urandom read for the whole batch; version=4 sets the RFC 4122 version/variant bits
+            raw = os.urandom(16 * count)
+            data = [str(uuid.UUID(bytes=raw[i:i + 16], version=4)) for i in range(0, 16 * count, 16)]
+            
+        else:
+            raise HTTPException(status_code=400, detail=f"Unsupported data type: {type}")
         
         return RandomDataResponse(
             type=type,
             data=data,
             count=count,
-            timestamp=datetime.utcnow()
+            timestamp=request.state.now
         )
         
     except Exception as e:
@@ -140,41 +187,47 @@ async def generate_random_data(
         raise HTTPException(status_code=500, detail="Random data generation failed")
 
 
-@router.get("/users", response_model=list[UserResponse])
+# List endpoints return pre-encoded JSON, so FastAPI's response_model pass is skipped;
+# the schema is still declared for the OpenAPI docs
+@router.get("/users", response_model=None, responses={200: {"model": UserPage}})
 async def get_users(
-    skip: int = Query(0, ge=0, description="Number of users to skip"),
+    skip: int = Query(0, ge=0, description="Number of users to skip (ignored when cursor is given)"),
+    cursor: Optional[int] = Query(None, description="next_cursor from the previous page"),
     limit: int = Query(10, ge=1, le=100, description="Maximum number of users to return")
 ):
     """Get users list (stateless)"""
     try:
-        async with get_async_session() as session:
-            result = await session.execute(
-                select(User)
-                .offset(skip)
-                .limit(limit)
-                .order_by(User.id)
-            )
-            users = result.scalars().all()
-            
-            return [UserResponse.from_orm(user) for user in users]
+        async def load():
+            query = select(*_USER_COLUMNS).limit(limit)
+            # Keyset pagination: seek past the last id instead of scanning OFFSET rows
+            query = query.where(User.id > cursor) if cursor is not None else query.offset(skip)
+            users = await _users_batcher.submit(query)
+            return {
+                "items": [UserResponse.from_row_fast(user).model_dump() for user in users],
+                "next_cursor": users[-1]["id"] if users else None,
+            }
+        
+        body = await cached_json_bytes(f"users:{skip}:{cursor}:{limit}", LIST_CACHE_TTL, load)
+        return Response(content=body, media_type="application/json")
             
     except Exception as e:
         logger.error(f"Get users error: {e}")
         raise HTTPException(status_code=500, detail="Failed to retrieve users")
 
 
-@router.get("/products", response_model=list[ProductResponse])
+@router.get("/products", response_model=None, responses={200: {"model": ProductPage}})
 async def get_products(
     category: str = Query(None, description="Filter by product category"),
     min_price: float = Query(None, ge=0, description="Minimum price filter"),
     max_price: float = Query(None, ge=0, description="Maximum price filter"),
     in_stock: bool = Query(None, description="Filter by stock availability"),
+    cursor: Optional[int] = Query(None, description="next_cursor from the previous page"),
     limit: int = Query(10, ge=1, le=100, description="Maximum number of products to return")
 ):
     """Get products list (stateless)"""
     try:
-        async with get_async_session() as session:
-            query = select(Product)
+        async def load():
+            query = select(*_PRODUCT_COLUMNS)
             
             # Apply filters
             if category:
@@ -185,15 +238,20 @@ async def get_products(
                 query = query.where(Product.price <= max_price)
             if in_stock is not None:
                 query = query.where(Product.is_available == in_stock)
+            if cursor is not None:
+                # Keyset on the (name, id) sort order, seeded from the cursor row
+                last = select(Product.name, Product.id).where(Product.id == cursor).scalar_subquery()
+                query = query.where(tuple_(Product.name, Product.id) > last)
             
-            result = await session.execute(
-                query
-                .limit(limit)
-                .order_by(Product.name)
-            )
-            products = result.scalars().all()
-            
-            return [ProductResponse.from_orm(product) for product in products]
+            products = await _products_batcher.submit(query.limit(limit))
+            return {
+                "items": [ProductSummary.from_row_fast(product).model_dump() for product in products],
+                "next_cursor": products[-1]["id"] if products else None,
+            }
+        
+        key = f"products:{category or ''}:{min_price}:{max_price}:{in_stock}:{cursor}:{limit}"
+        body = await cached_json_bytes(key, LIST_CACHE_TTL, load)
+        return Response(content=body, media_type="application/json")
             
     except Exception as e:
         logger.error(f"Get products error: {e}")
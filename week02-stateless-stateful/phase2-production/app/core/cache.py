@@ -0,0 +1,31 @@
+"""Redis-backed response cache for Phase 2 production"""
+
+from app.core.redis import redis_client
+from typing import Any, Awaitable, Callable
+import orjson
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+async def cached_json_bytes(key: str, ttl: int, loader: Callable[[], Awaitable[Any]]) -> bytes:
+    """Return the encoded JSON cached under key, or load, encode and cache it for ttl seconds"""
+    try:
+        raw = await redis_client.get(key)
+        if raw is not None:
+            return raw.encode() if isinstance(raw, str) else raw
+    except Exception as e:
+        logger.warning(f"Cache read failed for {key}: {e}")
+
+    body = orjson.dumps(await loader())
+
+    try:
+        await redis_client.setex(key, ttl, body)
+    except Exception as e:
+        logger.warning(f"Cache write failed for {key}: {e}")
+    return body
+
+
+async def cached_json(key: str, ttl: int, loader: Callable[[], Awaitable[Any]]) -> Any:
+    """Return the JSON value cached under key, or load it and cache it for ttl seconds"""
+    return orjson.loads(await cached_json_bytes(key, ttl, loader))
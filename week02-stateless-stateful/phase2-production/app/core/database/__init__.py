@@ -1,5 +1,5 @@
 """Database connection and management for Phase 2 production"""
 
-from .connection import engine, AsyncSessionLocal, Base, get_async_session
+from .connection import engine, AsyncSessionLocal, SessionScoped, Base, get_async_session, ping_database
 
-__all__ = ["engine", "AsyncSessionLocal", "Base", "get_async_session"]
+__all__ = ["engine", "AsyncSessionLocal", "SessionScoped", "Base", "get_async_session", "ping_database"]
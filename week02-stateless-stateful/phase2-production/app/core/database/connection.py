@@ -1,46 +1,68 @@
 """Database connection setup for Phase 2 production"""
 
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker, async_scoped_session
+from sqlalchemy.orm import declarative_base
 from app.core.config.settings import settings
+import asyncio
 import logging
 
 logger = logging.getLogger(__name__)
 
-# Create async engine
+# PgBouncer transaction pooling hands each transaction a different server
+# connection, so asyncpg must not cache prepared statements across them (and
+# PgBouncer rejects unknown startup parameters such as jit). Direct connections
+# turn JIT off: these short OLTP queries never recoup its compile time.
+if settings.database_pgbouncer:
+    _connect_args = {"statement_cache_size": 0, "prepared_statement_cache_size": 0}
+else:
+    _connect_args = {"server_settings": {"jit": "off"}}
+
+# Create async engine (no pre-ping: asyncpg reports dead connections itself,
+# and a SELECT 1 per checkout is a wasted round-trip)
 engine = create_async_engine(
     settings.database_url,
     echo=settings.database_echo,
     pool_size=settings.database_pool_size,
     max_overflow=settings.database_max_overflow,
-    pool_pre_ping=True,
-    pool_recycle=3600,  # Recycle connections every hour
+    pool_timeout=settings.database_pool_timeout,
+    pool_pre_ping=False,
+    pool_recycle=settings.database_pool_recycle,
+    connect_args=_connect_args,
 )
 
 # Create async session factory
-AsyncSessionLocal = sessionmaker(
+AsyncSessionLocal = async_sessionmaker(
     bind=engine,
     class_=AsyncSession,
     expire_on_commit=False,
     autoflush=False,
 )
 
+# One session per asyncio task, reused by everything running in that task
+SessionScoped = async_scoped_session(AsyncSessionLocal, scopefunc=asyncio.current_task)
+
 # Base class for models
 Base = declarative_base()
 
 
 async def get_async_session():
-    """Get async database session"""
-    async with AsyncSessionLocal() as session:
-        try:
-            yield session
-        except Exception as e:
-            logger.error(f"Database session error: {e}")
-            await session.rollback()
-            raise
-        finally:
-            await session.close()
+    """Get the request task's database session (FastAPI dependency)"""
+    session = SessionScoped()
+    try:
+        yield session
+    except Exception as e:
+        logger.error(f"Database session error: {e}")
+        await session.rollback()
+        raise
+    finally:
+        await SessionScoped.remove()
+
+
+async def ping_database(session: AsyncSession) -> bool:
+    """Round-trip a trivial query to check the database is reachable"""
+    await session.execute(text("SELECT 1"))
+    return True
 
 
 async def init_database():
@@ -1,5 +1,29 @@
 """Redis connection and management for Phase 2 production"""
 
-from .connection import redis_client, get_redis_client
+from .connection import (
+    redis_client,
+    get_redis_client,
+    SESSION_EXPIRY_INDEX,
+    set_session,
+    set_sessions,
+    get_session,
+    get_and_extend_session,
+    delete_session,
+    extend_session,
+    update_session_atomic,
+    add_to_cart_atomic,
+)
 
-__all__ = ["redis_client", "get_redis_client"]
+__all__ = [
+    "redis_client",
+    "get_redis_client",
+    "SESSION_EXPIRY_INDEX",
+    "set_session",
+    "set_sessions",
+    "get_session",
+    "get_and_extend_session",
+    "delete_session",
+    "extend_session",
+    "update_session_atomic",
+    "add_to_cart_atomic",
+]
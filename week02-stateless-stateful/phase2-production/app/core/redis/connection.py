@@ -1,10 +1,12 @@
 """Redis connection setup for Phase 2 production"""
 
 import redis.asyncio as redis
+from redis.exceptions import WatchError
 from app.core.config.settings import settings
 import logging
-import json
-from typing import Optional, Dict, Any
+import orjson
+import time
+from typing import Any, Callable, Dict, List, Optional
 
 logger = logging.getLogger(__name__)
 
@@ -20,19 +22,62 @@ redis_client = redis.from_url(
 )
 
 
+# Sorted set of session ids scored by expiry time, so cleanup never has to scan the keyspace
+SESSION_EXPIRY_INDEX = "sessions:by_expiry"
+
+
 async def get_redis_client():
     """Get Redis client (connection pool managed)"""
     return redis_client
 
 
+# Sessions are stored as hashes so counters and timestamps can be updated in
+# place; only the nested session_data field is JSON-encoded.
+_INT_FIELDS = frozenset({"user_id", "visit_count"})
+_BOOL_FIELDS = frozenset({"is_active"})
+
+
+def _encode_session(session_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Flatten a session dict into hash fields"""
+    fields = {}
+    for key, value in session_data.items():
+        if isinstance(value, bool):
+            fields[key] = int(value)
+        elif isinstance(value, (dict, list)):
+            fields[key] = orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+        elif value is not None:
+            fields[key] = value
+    return fields
+
+
+def _decode_session(fields) -> Dict[str, Any]:
+    """Rebuild a session dict from hash fields (a mapping or a flat HGETALL list)"""
+    if isinstance(fields, list):
+        fields = dict(zip(fields[::2], fields[1::2]))
+    session = {}
+    for key, value in fields.items():
+        if key in _INT_FIELDS:
+            session[key] = int(value)
+        elif key in _BOOL_FIELDS:
+            session[key] = value == "1"
+        elif key == "session_data":
+            session[key] = orjson.loads(value)
+        else:
+            session[key] = value
+    return session
+
+
 async def set_session(session_id: str, session_data: Dict[str, Any], ttl: Optional[int] = None):
     """Store session data in Redis"""
+    key = f"session:{session_id}"
+    ttl = ttl or settings.redis_session_ttl
     try:
-        await redis_client.setex(
-            f"session:{session_id}",
-            ttl or settings.redis_session_ttl,
-            json.dumps(session_data)
-        )
+        async with redis_client.pipeline(transaction=True) as pipe:
+            pipe.delete(key)
+            pipe.hset(key, mapping=_encode_session(session_data))
+            pipe.expire(key, ttl)
+            pipe.zadd(SESSION_EXPIRY_INDEX, {session_id: int(time.time()) + ttl})
+            await pipe.execute()
         logger.debug(f"Session stored: {session_id}")
         return True
     except Exception as e:
@@ -40,23 +85,188 @@ async def set_session(session_id: str, session_data: Dict[str, Any], ttl: Option
         return False
 
 
+async def set_sessions(sessions: List[Dict[str, Any]], ttl: Optional[int] = None) -> bool:
+    """Store many sessions (keyed by their "id") in one pipelined round-trip"""
+    ttl = ttl or settings.redis_session_ttl
+    try:
+        async with redis_client.pipeline(transaction=False) as pipe:
+            for session_data in sessions:
+                key = f"session:{session_data['id']}"
+                pipe.delete(key)
+                pipe.hset(key, mapping=_encode_session(session_data))
+                pipe.expire(key, ttl)
+            expires_at = int(time.time()) + ttl
+            pipe.zadd(SESSION_EXPIRY_INDEX, {session_data["id"]: expires_at for session_data in sessions})
+            await pipe.execute()
+        logger.debug(f"Sessions stored: {len(sessions)}")
+        return True
+    except Exception as e:
+        logger.error(f"Failed to store {len(sessions)} sessions: {e}")
+        return False
+
+
 async def get_session(session_id: str) -> Optional[Dict[str, Any]]:
     """Retrieve session data from Redis"""
     try:
-        data = await redis_client.get(f"session:{session_id}")
+        data = await redis_client.hgetall(f"session:{session_id}")
         if data:
             logger.debug(f"Session retrieved: {session_id}")
-            return json.loads(data)
+            return _decode_session(data)
+        return None
+    except Exception as e:
+        logger.error(f"Failed to retrieve session {session_id}: {e}")
+        return None
+
+
+async def get_and_extend_session(session_id: str, ttl: Optional[int] = None) -> Optional[Dict[str, Any]]:
+    """Retrieve a session and slide its TTL forward in one pipelined round-trip"""
+    key = f"session:{session_id}"
+    try:
+        async with redis_client.pipeline(transaction=False) as pipe:
+            pipe.hgetall(key)
+            pipe.expire(key, ttl or settings.redis_session_ttl)
+            data, _ = await pipe.execute()
+        if data:
+            logger.debug(f"Session retrieved and extended: {session_id}")
+            return _decode_session(data)
         return None
     except Exception as e:
         logger.error(f"Failed to retrieve session {session_id}: {e}")
         return None
 
 
+# Drops up to ARGV[2] index entries whose expiry (score) is <= ARGV[1]. Redis
+# has already expired those keys unless their TTL was slid forward since they
+# were indexed; those are re-scored rather than removed. Returns the count dropped.
+_CLEANUP_SESSIONS_LUA = """
+local ids = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, ARGV[2])
+local removed = 0
+for _, id in ipairs(ids) do
+  local pttl = redis.call('PTTL', 'session:' .. id)
+  if pttl > 0 then
+    redis.call('ZADD', KEYS[1], tonumber(ARGV[1]) + math.ceil(pttl / 1000), id)
+  else
+    if pttl == -1 then redis.call('DEL', 'session:' .. id) end
+    redis.call('ZREM', KEYS[1], id)
+    removed = removed + 1
+  end
+end
+return removed
+"""
+
+# Registered script is sent with EVALSHA and loaded on first NOSCRIPT
+_cleanup_sessions_script = redis_client.register_script(_CLEANUP_SESSIONS_LUA)
+
+
+# Session updates are merged in Python under WATCH/MULTI: the transaction is
+# retried if another client writes the session between the read and the write,
+# so concurrent updates cannot overwrite each other. session_data is decoded and
+# re-encoded with orjson only, so client JSON (empty arrays, big ints, floats)
+# round-trips exactly.
+MAX_WATCH_RETRIES = 5
+
+
+async def _merge_session(
+    key: str,
+    merge: Callable[[Dict[str, Any]], Dict[str, Any]],
+    ttl: int,
+    count_visit: bool = False,
+):
+    """Apply merge(current_fields) -> changed_fields atomically; returns the new hash or None"""
+    async with redis_client.pipeline(transaction=True) as pipe:
+        for _ in range(MAX_WATCH_RETRIES):
+            try:
+                await pipe.watch(key)
+                current = await pipe.hgetall(key)
+                if not current:
+                    await pipe.unwatch()
+                    return None
+                changes = merge(current)
+                pipe.multi()
+                if changes:
+                    pipe.hset(key, mapping=changes)
+                if count_visit:
+                    pipe.hincrby(key, "visit_count", 1)
+                pipe.expire(key, ttl)
+                pipe.hgetall(key)
+                return (await pipe.execute())[-1]
+            except WatchError:
+                continue
+    raise WatchError(f"{key} kept changing; gave up after {MAX_WATCH_RETRIES} attempts")
+
+
+async def update_session_atomic(
+    session_id: str,
+    updated_at: str,
+    session_data: Optional[Dict[str, Any]] = None,
+    is_active: Optional[bool] = None,
+    ttl: Optional[int] = None,
+) -> Optional[Dict[str, Any]]:
+    """Merge updates into a session; returns the new session or None (raises WatchError if contention persists)"""
+
+    # Every update counts as a visit and bumps updated_at, even if nothing else changes
+    def merge(current):
+        changes = {"updated_at": updated_at}
+        if is_active is not None:
+            changes["is_active"] = int(is_active)
+        if session_data:
+            data = orjson.loads(current.get("session_data") or "{}")
+            data.update(session_data)
+            changes["session_data"] = orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+        return changes
+
+    try:
+        data = await _merge_session(
+            f"session:{session_id}", merge, ttl or settings.redis_session_ttl, count_visit=True
+        )
+        return _decode_session(data) if data else None
+    except WatchError:
+        raise
+    except Exception as e:
+        logger.error(f"Failed to update session {session_id}: {e}")
+        return None
+
+
+async def add_to_cart_atomic(
+    session_id: str,
+    product_id: int,
+    quantity: int,
+    updated_at: str,
+    ttl: Optional[int] = None,
+) -> Optional[Dict[str, Any]]:
+    """Add a cart item to a session; returns the new session or None (raises WatchError if contention persists)"""
+
+    # The cart is a {product_id: quantity} map; list-shaped carts from older
+    # sessions are converted on their first update.
+    def merge(current):
+        data = orjson.loads(current.get("session_data") or "{}")
+        cart = data.get("cart")
+        if not isinstance(cart, dict):
+            converted = {}
+            for item in cart or []:
+                k = str(item["product_id"])
+                converted[k] = converted.get(k, 0) + item["quantity"]
+            cart = data["cart"] = converted
+        cart[str(product_id)] = cart.get(str(product_id), 0) + quantity
+        return {"session_data": orjson.dumps(data), "updated_at": updated_at}
+
+    try:
+        data = await _merge_session(f"session:{session_id}", merge, ttl or settings.redis_session_ttl)
+        return _decode_session(data) if data else None
+    except WatchError:
+        raise
+    except Exception as e:
+        logger.error(f"Failed to add to cart for session {session_id}: {e}")
+        return None
+
+
 async def delete_session(session_id: str) -> bool:
     """Delete session from Redis"""
     try:
-        result = await redis_client.delete(f"session:{session_id}")
+        async with redis_client.pipeline(transaction=False) as pipe:
+            pipe.delete(f"session:{session_id}")
+            pipe.zrem(SESSION_EXPIRY_INDEX, session_id)
+            result, _ = await pipe.execute()
         if result:
             logger.debug(f"Session deleted: {session_id}")
         return result > 0
@@ -86,14 +296,15 @@ async def is_session_valid(session_id: str) -> bool:
         return False
 
 
-async def cleanup_expired_sessions() -> int:
+async def cleanup_expired_sessions(batch_size: int = 1000) -> int:
     """Clean up expired sessions (maintenance task)"""
     try:
-        # This would typically use Redis keys with pattern matching
-        # For now, return count of active sessions
-        active_sessions = await redis_client.dbsize()
-        logger.info(f"Active sessions count: {active_sessions}")
-        return active_sessions
+        removed = await _cleanup_sessions_script(
+            keys=[SESSION_EXPIRY_INDEX],
+            args=[int(time.time()), batch_size],
+        )
+        logger.info(f"Expired sessions removed: {removed}")
+        return removed
     except Exception as e:
         logger.error(f"Failed to cleanup sessions: {e}")
         return 0
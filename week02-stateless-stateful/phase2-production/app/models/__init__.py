@@ -1,7 +1,8 @@
 """Database models for Phase 2 production implementation"""
 
+from app.core.database import Base
 from .user import User
 from .product import Product
 from .session import Session
 
-__all__ = ["User", "Product", "Session"]
+__all__ = ["Base", "User", "Product", "Session"]
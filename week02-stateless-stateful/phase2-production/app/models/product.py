@@ -1,17 +1,21 @@
 """Product model for Phase 2 production"""
 
-from sqlalchemy import Column, Integer, String, Float, DateTime, Text, Boolean
-from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy import Column, Integer, String, Float, DateTime, Text, Boolean, Index
 from sqlalchemy.sql import func
 from datetime import datetime
-
-Base = declarative_base()
+from app.core.database import Base
 
 
 class Product(Base):
     """Product model for catalog and shopping cart functionality"""
     
     __tablename__ = "products"
+    __table_args__ = (
+        # /products filters: category, availability, then a price range
+        Index("ix_product_cat_avail_price", "category", "is_available", "price"),
+        # /products keyset pagination orders by (name, id)
+        Index("ix_product_name_id", "name", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(200), nullable=False, index=True)
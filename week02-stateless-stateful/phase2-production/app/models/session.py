@@ -1,13 +1,11 @@
 """Session model for Phase 2 production"""
 
 from sqlalchemy import Column, Integer, String, DateTime, JSON, Boolean, ForeignKey
-from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import uuid
-
-Base = declarative_base()
+from app.core.database import Base
 
 
 class Session(Base):
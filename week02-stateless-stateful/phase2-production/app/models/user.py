@@ -1,11 +1,9 @@
 """User model for Phase 2 production"""
 
 from sqlalchemy import Column, Integer, String, DateTime, JSON, Boolean
-from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.sql import func
 from datetime import datetime
-
-Base = declarative_base()
+from app.core.database import Base
 
 
 class User(Base):
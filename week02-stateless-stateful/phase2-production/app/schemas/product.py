@@ -1,7 +1,7 @@
 """Product schemas for Phase 2 production API"""
 
-from pydantic import BaseModel, validator
-from typing import Optional
+from pydantic import BaseModel, field_validator
+from typing import Optional, List
 from datetime import datetime
 
 
@@ -14,6 +14,14 @@ class ProductBase(BaseModel):
     stock: int = 100
     is_available: bool = True
 
+    @field_validator("price", "stock")
+    @classmethod
+    def validate_non_negative(cls, v):
+        """Validate price and stock fields"""
+        if v is not None and v < 0:
+            raise ValueError("must be non-negative")
+        return v
+
 
 class ProductCreate(ProductBase):
     """Schema for creating new products"""
@@ -40,6 +48,29 @@ class ProductResponse(ProductBase):
         from_attributes = True
 
 
+class ProductSummary(BaseModel):
+    """Schema for product list entries (no description)"""
+    id: int
+    name: str
+    category: str
+    price: float
+    stock: int
+    is_available: bool
+    created_at: datetime
+    updated_at: datetime
+
+    @classmethod
+    def from_row_fast(cls, row):
+        """Build from a trusted DB row mapping without running validation"""
+        return cls.model_construct(**row)
+
+
+class ProductPage(BaseModel):
+    """Schema for a keyset-paginated product list"""
+    items: List[ProductSummary]
+    next_cursor: Optional[int] = None
+
+
 class ProductStockUpdate(BaseModel):
     """Schema for updating product stock"""
     quantity: int
@@ -53,19 +84,3 @@ class ProductSearch(BaseModel):
     max_price: Optional[float] = None
     in_stock: Optional[bool] = None
     limit: int = 50
-
-
-@validator('price')
-def validate_price(cls, v):
-    """Validate price field"""
-    if v is not None and v < 0:
-        raise ValueError('Price must be non-negative')
-    return v
-
-
-@validator('stock')
-def validate_stock(cls, v):
-    """Validate stock field"""
-    if v is not None and v < 0:
-        raise ValueError('Stock must be non-negative')
-    return v
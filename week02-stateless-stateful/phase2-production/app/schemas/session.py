@@ -1,6 +1,6 @@
 """Session schemas for Phase 2 production API"""
 
-from pydantic import BaseModel, validator
+from pydantic import BaseModel, field_validator
 from typing import Optional, Dict, Any
 from datetime import datetime
 
@@ -12,6 +12,12 @@ class SessionBase(BaseModel):
     visit_count: int = 0
     is_active: bool = True
 
+    @field_validator("session_data", mode="before")
+    @classmethod
+    def validate_session_data(cls, v):
+        """Validate session_data field"""
+        return {} if v is None else v
+
 
 class SessionCreate(SessionBase):
     """Schema for creating new sessions"""
@@ -39,20 +45,10 @@ class SessionExtension(BaseModel):
     """Schema for extending session TTL"""
     minutes: int = 30
 
-
-@validator('session_data')
-def validate_session_data(cls, v):
-    """Validate session_data field"""
-    if v is None:
-        return {}
-    if not isinstance(v, dict):
-        raise ValueError('Session data must be a dictionary')
-    return v
-
-
-@validator('minutes')
-def validate_extension_minutes(cls, v):
-    """Validate extension minutes"""
-    if v is not None and (v < 1 or v > 1440):  # Max 24 hours
-        raise ValueError('Extension minutes must be between 1 and 1440')
-    return v
+    @field_validator("minutes")
+    @classmethod
+    def validate_extension_minutes(cls, v):
+        """Validate extension minutes"""
+        if v < 1 or v > 1440:  # Max 24 hours
+            raise ValueError("Extension minutes must be between 1 and 1440")
+        return v
@@ -1,7 +1,7 @@
 """User schemas for Phase 2 production API"""
 
-from pydantic import BaseModel, EmailStr, validator
-from typing import Optional, Dict, Any
+from pydantic import BaseModel, EmailStr, field_validator
+from typing import Optional, Dict, Any, List
 from datetime import datetime
 
 
@@ -12,6 +12,12 @@ class UserBase(BaseModel):
     preferences: Optional[Dict[str, Any]] = {}
     is_active: bool = True
 
+    @field_validator("preferences", mode="before")
+    @classmethod
+    def validate_preferences(cls, v):
+        """Validate preferences field"""
+        return {} if v is None else v
+
 
 class UserCreate(UserBase):
     """Schema for creating new users"""
@@ -35,6 +41,17 @@ class UserResponse(UserBase):
     class Config:
         from_attributes = True
 
+    @classmethod
+    def from_row_fast(cls, row):
+        """Build from a trusted DB row mapping without running validation"""
+        return cls.model_construct(**{**row, "preferences": row["preferences"] or {}})
+
+
+class UserPage(BaseModel):
+    """Schema for a keyset-paginated user list"""
+    items: List[UserResponse]
+    next_cursor: Optional[int] = None
+
 
 class UserLogin(BaseModel):
     """Schema for user login"""
@@ -48,13 +65,3 @@ class UserAuth(BaseModel):
     name: str
     email: EmailStr
     preferences: Dict[str, Any]
-
-
-@validator('preferences', pre=True)
-def validate_preferences(cls, v):
-    """Validate preferences field"""
-    if v is None:
-        return {}
-    if not isinstance(v, dict):
-        raise ValueError('Preferences must be a dictionary')
-    return v
@@ -0,0 +1,24 @@
+"""Composite indexes for the product list query
+
+Revision ID: 002
+Revises: 001
+Create Date: 2026-10-15 12:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '002'
+down_revision = '001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_product_cat_avail_price', 'products', ['category', 'is_available', 'price'], unique=False)
+    op.create_index('ix_product_name_id', 'products', ['name', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_product_name_id', table_name='products')
+    op.drop_index('ix_product_cat_avail_price', table_name='products')
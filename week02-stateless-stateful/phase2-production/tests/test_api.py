@@ -4,15 +4,31 @@ import pytest
 from fastapi.testclient import TestClient
 from app.main import app
 from app.core.config.settings import settings
+from app.core.redis import connection as redis_connection
+from redis.exceptions import WatchError
+from concurrent.futures import ThreadPoolExecutor
 import json
 
-client = TestClient(app)
+
+@pytest.fixture(scope="session")
+def client():
+    """One TestClient (and one app lifespan) shared by the whole test session"""
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def session_id(client):
+    """A freshly created session for user 1"""
+    response = client.post("/api/v1/stateful/sessions?user_id=1")
+    assert response.status_code == 200
+    return response.json()["id"]
 
 
 class TestHealthEndpoints:
     """Test health check endpoints"""
     
-    def test_shared_health(self):
+    def test_shared_health(self, client):
         """Test shared health endpoint"""
         response = client.get("/api/v1/shared/health")
         assert response.status_code == 200
@@ -22,7 +38,7 @@ class TestHealthEndpoints:
         assert "version" in data
         assert "components" in data
     
-    def test_stateless_health(self):
+    def test_stateless_health(self, client):
         """Test stateless health endpoint"""
         response = client.get("/api/v1/stateless/health")
         assert response.status_code == 200
@@ -30,7 +46,7 @@ class TestHealthEndpoints:
         assert data["status"] == "healthy"
         assert data["components"]["stateless_mode"] == "enabled"
     
-    def test_stateful_health(self):
+    def test_stateful_health(self, client):
         """Test stateful health endpoint"""
         response = client.get("/api/v1/stateful/health")
         assert response.status_code == 200
@@ -42,7 +58,7 @@ class TestHealthEndpoints:
 class TestStatelessAPI:
     """Test stateless API endpoints"""
     
-    def test_stateless_info(self):
+    def test_stateless_info(self, client):
         """Test stateless info endpoint"""
         response = client.get("/api/v1/stateless/info")
         assert response.status_code == 200
@@ -51,7 +67,7 @@ class TestStatelessAPI:
         assert "capabilities" in data
         assert "endpoints" in data
     
-    def test_calculate_add(self):
+    def test_calculate_add(self, client):
         """Test calculation endpoint - addition"""
         payload = {"operation": "add", "operand1": 5, "operand2": 3}
         response = client.post("/api/v1/stateless/calculate", json=payload)
@@ -60,14 +76,47 @@ class TestStatelessAPI:
         assert data["result"] == 8
         assert data["operation"] == "add"
     
-    def test_calculate_divide_by_zero(self):
+    def test_calculate_divide_by_zero(self, client):
         """Test calculation endpoint - division by zero"""
         payload = {"operation": "divide", "operand1": 5, "operand2": 0}
         response = client.post("/api/v1/stateless/calculate", json=payload)
         assert response.status_code == 400
         assert "Division by zero" in response.json()["detail"]
     
-    def test_random_numbers(self):
+    @pytest.mark.parametrize("operation, operand2, expected", [
+        ("add", 3, 8),
+        ("subtract", 3, 2),
+        ("multiply", 3, 15),
+        ("divide", 4, 1.25),
+        ("add", None, 5),
+        ("subtract", None, 5),
+        ("multiply", None, 5),
+    ])
+    def test_calculate_operations(self, client, operation, operand2, expected):
+        """Every supported operation, including the default when operand2 is omitted"""
+        payload = {"operation": operation, "operand1": 5}
+        if operand2 is not None:
+            payload["operand2"] = operand2
+        response = client.post("/api/v1/stateless/calculate", json=payload)
+        assert response.status_code == 200
+        data = response.json()
+        assert data["result"] == expected
+        assert data["operand2"] == operand2
+    
+    def test_calculate_divide_without_operand2(self, client):
+        """Division has no default divisor, so omitting it fails"""
+        payload = {"operation": "divide", "operand1": 5}
+        response = client.post("/api/v1/stateless/calculate", json=payload)
+        assert response.status_code == 500
+    
+    def test_calculate_unsupported_operation(self, client):
+        """Unknown operations are rejected"""
+        payload = {"operation": "modulo", "operand1": 5, "operand2": 3}
+        response = client.post("/api/v1/stateless/calculate", json=payload)
+        assert response.status_code == 400
+        assert "Unsupported operation" in response.json()["detail"]
+    
+    def test_random_numbers(self, client):
         """Test random data generation - numbers"""
         response = client.get("/api/v1/stateless/random?type=number&count=3&min_value=1&max_value=10")
         assert response.status_code == 200
@@ -76,7 +125,7 @@ class TestStatelessAPI:
         assert len(data["data"]) == 3
         assert all(1 <= num <= 10 for num in data["data"])
     
-    def test_random_strings(self):
+    def test_random_strings(self, client):
         """Test random data generation - strings"""
         response = client.get("/api/v1/stateless/random?type=string&count=2")
         assert response.status_code == 200
@@ -84,12 +133,68 @@ class TestStatelessAPI:
         assert data["type"] == "string"
         assert len(data["data"]) == 2
         assert all(isinstance(s, str) for s in data["data"])
+    
+    @pytest.mark.parametrize("resource", ["users", "products"])
+    def test_list_page_shape(self, client, resource):
+        """List endpoints return {"items", "next_cursor"} with next_cursor the last item's id"""
+        response = client.get(f"/api/v1/stateless/{resource}?limit=2")
+        assert response.status_code == 200
+        data = response.json()
+        assert set(data) == {"items", "next_cursor"}
+        assert len(data["items"]) <= 2
+        if data["items"]:
+            assert data["next_cursor"] == data["items"][-1]["id"]
+        else:
+            assert data["next_cursor"] is None
+    
+    @pytest.mark.parametrize("resource", ["users", "products"])
+    def test_list_cursor_round_trip(self, client, resource):
+        """Following next_cursor continues exactly where the previous page stopped"""
+        url = f"/api/v1/stateless/{resource}"
+        expected = [item["id"] for item in client.get(f"{url}?limit=6").json()["items"]]
+        first = client.get(f"{url}?limit=3").json()
+        ids = [item["id"] for item in first["items"]]
+        if first["next_cursor"] is not None:
+            second = client.get(f"{url}?limit=3&cursor={first['next_cursor']}").json()
+            ids += [item["id"] for item in second["items"]]
+        assert ids == expected
+        assert len(set(ids)) == len(ids)
+    
+    def test_users_cursor_is_keyset(self, client):
+        """User pages are ordered by id and start strictly after the cursor"""
+        ids = [user["id"] for user in client.get("/api/v1/stateless/users?limit=100").json()["items"]]
+        assert ids == sorted(ids)
+        if ids:
+            page = client.get(f"/api/v1/stateless/users?cursor={ids[0]}&limit=100").json()
+            assert [user["id"] for user in page["items"]] == ids[1:]
+    
+    @pytest.mark.parametrize("resource", ["users", "products"])
+    def test_list_last_page(self, client, resource):
+        """A cursor past the last row returns an empty page with no next_cursor"""
+        response = client.get(f"/api/v1/stateless/{resource}?cursor={2 ** 31 - 1}")
+        assert response.status_code == 200
+        assert response.json() == {"items": [], "next_cursor": None}
+    
+    @pytest.mark.parametrize("resource", ["users", "products"])
+    def test_concurrent_list_queries_are_not_mixed(self, client, resource):
+        """Concurrent pages that share a batched query each get their own rows"""
+        url = f"/api/v1/stateless/{resource}"
+        ids = [item["id"] for item in client.get(f"{url}?limit=100").json()["items"]]
+        starts = ids[:8]
+        
+        def page(cursor):
+            return client.get(f"{url}?cursor={cursor}&limit=4").json()["items"]
+        
+        with ThreadPoolExecutor(max_workers=len(starts) or 1) as pool:
+            pages = list(pool.map(page, starts))
+        for i, items in enumerate(pages):
+            assert [item["id"] for item in items] == ids[i + 1:i + 5]
 
 
 class TestStatefulAPI:
     """Test stateful API endpoints"""
     
-    def test_create_session(self):
+    def test_create_session(self, client):
         """Test session creation"""
         response = client.post("/api/v1/stateful/sessions?user_id=1")
         assert response.status_code == 200
@@ -98,38 +203,49 @@ class TestStatefulAPI:
         assert data["user_id"] == 1
         assert data["visit_count"] == 1
         assert data["is_active"] is True
-        
-        # Store session ID for subsequent tests
-        TestStatefulAPI.session_id = data["id"]
     
-    def test_get_session(self):
+    def test_get_session(self, client, session_id):
         """Test getting session by ID"""
-        if not hasattr(TestStatefulAPI, 'session_id'):
-            pytest.skip("No session ID available")
-        
-        response = client.get(f"/api/v1/stateful/sessions/{TestStatefulAPI.session_id}")
+        response = client.get(f"/api/v1/stateful/sessions/{session_id}")
         assert response.status_code == 200
         data = response.json()
-        assert data["id"] == TestStatefulAPI.session_id
+        assert data["id"] == session_id
         assert data["user_id"] == 1
     
-    def test_update_session(self):
+    def test_update_session(self, client, session_id):
         """Test updating session"""
-        if not hasattr(TestStatefulAPI, 'session_id'):
-            pytest.skip("No session ID available")
-        
         payload = {"session_data": {"test_key": "test_value"}}
-        response = client.put(f"/api/v1/stateful/sessions/{TestStatefulAPI.session_id}", json=payload)
+        response = client.put(f"/api/v1/stateful/sessions/{session_id}", json=payload)
         assert response.status_code == 200
         data = response.json()
         assert data["session_data"]["test_key"] == "test_value"
     
-    def test_add_to_cart(self):
-        """Test adding items to cart"""
-        if not hasattr(TestStatefulAPI, 'session_id'):
-            pytest.skip("No session ID available")
+    def test_update_session_counts_every_visit(self, client, session_id):
+        """A PUT counts as a visit even when it changes nothing"""
+        url = f"/api/v1/stateful/sessions/{session_id}"
+        visits = client.get(url).json()["visit_count"]
         
-        response = client.post(f"/api/v1/stateful/cart/{TestStatefulAPI.session_id}?product_id=1&quantity=2")
+        response = client.put(url, json={})
+        assert response.status_code == 200
+        assert response.json()["visit_count"] == visits + 1
+        
+        response = client.put(url, json={"is_active": True})
+        assert response.status_code == 200
+        assert response.json()["visit_count"] == visits + 2
+        assert response.json()["is_active"] is True
+    
+    def test_update_session_keeps_client_json(self, client, session_id):
+        """session_data values round-trip unchanged (empty arrays, large ints, floats)"""
+        payload = {"session_data": {"tags": [], "big": 2 ** 60, "ratio": 0.12345678901234568}}
+        client.put(f"/api/v1/stateful/sessions/{session_id}", json=payload)
+        data = client.get(f"/api/v1/stateful/sessions/{session_id}").json()["session_data"]
+        assert data["tags"] == []
+        assert data["big"] == 2 ** 60
+        assert data["ratio"] == 0.12345678901234568
+    
+    def test_add_to_cart(self, client, session_id):
+        """Test adding items to cart"""
+        response = client.post(f"/api/v1/stateful/cart/{session_id}?product_id=1&quantity=2")
         assert response.status_code == 200
         data = response.json()
         assert "cart" in data
@@ -137,22 +253,34 @@ class TestStatefulAPI:
         assert data["cart"][0]["product_id"] == 1
         assert data["cart"][0]["quantity"] == 2
     
-    def test_get_cart(self):
+    def test_get_cart(self, client, session_id):
         """Test getting cart contents"""
-        if not hasattr(TestStatefulAPI, 'session_id'):
-            pytest.skip("No session ID available")
-        
-        response = client.get(f"/api/v1/stateful/cart/{TestStatefulAPI.session_id}")
+        client.post(f"/api/v1/stateful/cart/{session_id}?product_id=1&quantity=2")
+        response = client.get(f"/api/v1/stateful/cart/{session_id}")
         assert response.status_code == 200
         data = response.json()
         assert "cart" in data
         assert len(data["cart"]) >= 1
+    
+    def test_cart_accumulates_quantities(self, client, session_id):
+        """Adding the same product again raises its quantity instead of adding a line"""
+        url = f"/api/v1/stateful/cart/{session_id}"
+        client.post(f"{url}?product_id=1&quantity=2")
+        client.post(f"{url}?product_id=2&quantity=1")
+        response = client.post(f"{url}?product_id=1&quantity=3")
+        assert response.status_code == 200
+        expected = {1: 5, 2: 1}
+        assert {item["product_id"]: item["quantity"] for item in response.json()["cart"]} == expected
+        
+        cart = client.get(url).json()["cart"]
+        assert len(cart) == 2
+        assert {item["product_id"]: item["quantity"] for item in cart} == expected
 
 
 class TestSharedAPI:
     """Test shared API endpoints"""
     
-    def test_metrics(self):
+    def test_metrics(self, client):
         """Test metrics endpoint"""
         response = client.get("/api/v1/shared/metrics")
         assert response.status_code == 200
@@ -161,7 +289,7 @@ class TestSharedAPI:
         assert "timestamp" in data
         assert "active_sessions" in data["metrics"]
     
-    def test_app_info(self):
+    def test_app_info(self, client):
         """Test application info endpoint"""
         response = client.get("/api/v1/shared/info")
         assert response.status_code == 200
@@ -170,7 +298,81 @@ class TestSharedAPI:
         assert "architecture" in data
         assert "endpoints" in data
         assert "features" in data
+    
+    def test_app_info_etag(self, client):
+        """Application info carries an ETag and a cache lifetime"""
+        response = client.get("/api/v1/shared/info")
+        assert response.headers["etag"].startswith('"')
+        assert response.headers["cache-control"] == "public, max-age=300"
+    
+    @pytest.mark.parametrize("header", ["{etag}", "W/{etag}", '"stale", {etag}', "*"])
+    def test_app_info_not_modified(self, client, header):
+        """A matching If-None-Match gets an empty 304 with the same validators"""
+        etag = client.get("/api/v1/shared/info").headers["etag"]
+        response = client.get("/api/v1/shared/info", headers={"If-None-Match": header.format(etag=etag)})
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+    
+    def test_app_info_stale_etag(self, client):
+        """A non-matching If-None-Match gets the full body"""
+        response = client.get("/api/v1/shared/info", headers={"If-None-Match": '"stale"'})
+        assert response.status_code == 200
+        assert response.json()["version"] == "2.0.0"
 
 
 if __name__ == "__main__":
     pytest.main([__file__])
+
+
+class _ConflictingPipeline:
+    """Pipeline stand-in whose transaction always loses the WATCH race"""
+    
+    def __init__(self):
+        self.attempts = 0
+        self.queued = False
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc):
+        return False
+    
+    async def watch(self, key):
+        self.queued = False
+    
+    def hgetall(self, key):
+        if self.queued:
+            return self
+        
+        async def fetch():
+            return {"id": "s", "visit_count": "1", "session_data": "{}"}
+        return fetch()
+    
+    def multi(self):
+        self.queued = True
+    
+    def hset(self, *args, **kwargs):
+        return self
+    
+    def hincrby(self, *args):
+        return self
+    
+    def expire(self, *args):
+        return self
+    
+    async def execute(self):
+        self.attempts += 1
+        raise WatchError("watched key changed")
+
+
+class TestSessionMergeRetries:
+    """WATCH/MULTI session updates give up after a bounded number of attempts"""
+    
+    @pytest.mark.asyncio
+    async def test_retries_are_capped(self, monkeypatch):
+        pipeline = _ConflictingPipeline()
+        monkeypatch.setattr(redis_connection.redis_client, "pipeline", lambda transaction=True: pipeline)
+        with pytest.raises(WatchError):
+            await redis_connection.update_session_atomic("s", "2026-01-01T00:00:00")
+        assert pipeline.attempts == redis_connection.MAX_WATCH_RETRIES
@@ -5,6 +5,8 @@ import os
 from pathlib import Path
 import signal
 
+import httpx
+
 # Configuration
 SERVICES = [
     {"name": "Upload", "port": 8001, "app": "services.upload.app.main:app"},
@@ -15,6 +17,11 @@ SERVICES = [
 
 PROCESSES = []
 
+# How long to wait for every service's /health to answer 200, and the poll backoff bounds
+READY_TIMEOUT = 10.0
+POLL_INTERVAL_MIN = 0.05
+POLL_INTERVAL_MAX = 0.5
+
 def start_services():
     print("[INFO] Starting services...")
     # Get python executable from current environment (venv)
@@ -29,20 +36,40 @@ def start_services():
             "--host", "0.0.0.0"
         ]
         
-        # Start process
+        # Start process; output is discarded, since an unread PIPE can fill up and stall uvicorn
         proc = subprocess.Popen(
             cmd,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL
         )
         PROCESSES.append(proc)
         
-    print("[INFO] Waiting 3s for services to initialize...", flush=True)
-    for i in range(3):
-        print(f"Tick {i}", flush=True)
-        time.sleep(1)
-    print("[INFO] Sleep finished", flush=True)
+    wait_for_services()
+
+def wait_for_services():
+    """Poll every service's /health until all answer 200 or READY_TIMEOUT passes"""
+    print(f"[INFO] Waiting up to {READY_TIMEOUT:.0f}s for services to become ready...", flush=True)
+    pending = {service["name"]: service["port"] for service in SERVICES}
+    deadline = time.monotonic() + READY_TIMEOUT
+    interval = POLL_INTERVAL_MIN
+    
+    with httpx.Client(timeout=0.2) as client:
+        while pending and time.monotonic() < deadline:
+            for name, port in list(pending.items()):
+                try:
+                    if client.get(f"http://localhost:{port}/health").status_code == 200:
+                        print(f"  {name} ready", flush=True)
+                        del pending[name]
+                except httpx.HTTPError:
+                    pass
+            if pending:
+                time.sleep(interval)
+                interval = min(interval * 2, POLL_INTERVAL_MAX)
+    
+    if pending:
+        print(f"[WARN] Not ready after {READY_TIMEOUT:.0f}s: {', '.join(pending)}", flush=True)
+    else:
+        print("[INFO] All services ready", flush=True)
 
 def stop_services():
     print("\n[INFO] Stopping services...")
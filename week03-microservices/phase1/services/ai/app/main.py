@@ -1,28 +1,34 @@
-from fastapi import FastAPI, HTTPException
-from fastapi.responses import JSONResponse
-from pydantic import BaseModel
-from datetime import datetime
-import uuid
-import json
+from fastapi import FastAPI, HTTPException, Depends, Request
+from fastapi.responses import JSONResponse, Response
+from datetime import datetime, timedelta
+import asyncio
+import msgspec
+import os
 from pathlib import Path
 import logging
 import random
+import secrets
+import time
+from services.common.health import HealthBody, HealthCheckInterceptor, second_clock
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="Phase 1 AI Service", version="1.0.0")
-
 # Mock AI analysis directory
 AI_DIR = Path("mock_storage")
 AI_DIR.mkdir(exist_ok=True)
 
-class AIRequest(BaseModel):
+# Request/response types are msgspec Structs: decoded and encoded in C, no Pydantic pass
+class AIRequest(msgspec.Struct):
     analysis_type: str = "general"  # general, vision, nlp, classification
     confidence_threshold: float = 0.7
 
-class AIResponse(BaseModel):
+class AIBatchRequest(msgspec.Struct):
+    file_ids: list[str]
+    analysis_type: str = "general"
+
+class AIResponse(msgspec.Struct):
     file_id: str
     analysis_type: str
     results: dict
@@ -30,6 +36,35 @@ class AIResponse(BaseModel):
     model_version: str
     timestamp: str
 
+_json_encoder = msgspec.json.Encoder()
+
+# Simulated per-analysis delay in seconds, set via MOCK_LATENCY_MS (default: none)
+MOCK_LATENCY = float(os.getenv("MOCK_LATENCY_MS", "0")) / 1000
+
+# Files from one batch request analyzed at the same time
+BATCH_CONCURRENCY = 16
+
+class MsgspecResponse(Response):
+    """JSON response encoded with msgspec (handles Structs and plain containers)"""
+    media_type = "application/json"
+
+    def render(self, content) -> bytes:
+        return _json_encoder.encode(content)
+
+app = FastAPI(title="Phase 1 AI Service", version="1.0.0", default_response_class=MsgspecResponse)
+
+def msgspec_body(struct_type):
+    """Build a dependency that decodes the JSON request body straight into struct_type"""
+    decoder = msgspec.json.Decoder(struct_type)
+
+    async def parse(request: Request):
+        try:
+            return decoder.decode(await request.body() or b"{}")
+        except msgspec.DecodeError as e:
+            raise HTTPException(status_code=422, detail=str(e))
+
+    return parse
+
 # Mock AI responses for different file types
 MOCK_AI_RESPONSES = {
     "image": {
@@ -61,18 +96,73 @@ MOCK_AI_RESPONSES = {
     }
 }
 
+# Per-request pieces of the mock analysis that never change, built once at import
+_MODEL_NAMES = {category: f"mock-ai-{category}-v1.0" for category in MOCK_AI_RESPONSES}
+_CLASSIFICATION_CATEGORIES = ("personal", "business", "educational", "entertainment")
+_CLASSIFICATION_SUBCATEGORIES = ("document", "media", "archive", "other")
+_CLASSIFICATION_TAGS = ("important", "draft", "final", "shared")
+_DETECTABLE_OBJECTS = tuple(MOCK_AI_RESPONSES["image"]["objects"])
+_SCENES = ("indoor", "outdoor", "nature", "urban")
+_ANALYSIS_TYPES = ("general", "vision", "nlp", "classification")
+_NLP_ANALYSIS = {
+    "entities": [
+        {"text": "Sample Corp", "label": "ORG"},
+        {"text": "John Doe", "label": "PERSON"},
+        {"text": "New York", "label": "LOC"}
+    ],
+    "summary": "This document contains sample business content.",
+    "keywords": ["business", "sample", "document"]
+}
+
+# Timestamps are UTC ISO 8601 at one-second resolution, formatted once per second
+_iso_now = second_clock(lambda second: datetime.utcfromtimestamp(second).isoformat() + "Z")
+
+# Liveness probes hit /health constantly; answer them before routing and validation
+health_body = HealthBody("ai-service", timestamp=_iso_now)
+app.add_middleware(HealthCheckInterceptor, body=health_body)
+
 @app.get("/health")
 async def health_check():
-    """Health check endpoint"""
-    return {"status": "healthy", "service": "ai-service", "timestamp": datetime.now().isoformat()}
+    """Health check endpoint (answered by HealthCheckInterceptor; kept for the OpenAPI docs)"""
+    return Response(health_body(), media_type="application/json")
+
+# Declared before /analyze/{file_id}, which would otherwise capture "batch" as a file id
+@app.post("/analyze/batch")
+async def batch_analyze_files(batch: AIBatchRequest = Depends(msgspec_body(AIBatchRequest))):
+    """Analyze multiple files in batch"""
+    semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+    request = AIRequest(analysis_type=batch.analysis_type)
+    
+    async def analyze_one(file_id: str) -> dict:
+        async with semaphore:
+            try:
+                result = await run_analysis(file_id, request)
+                return {"file_id": file_id, "status": "success", "result": result}
+            except Exception as e:
+                return {"file_id": file_id, "status": "failed", "error": str(e)}
+    
+    results = await asyncio.gather(*(analyze_one(file_id) for file_id in batch.file_ids))
+    successful = sum(1 for r in results if r["status"] == "success")
+    
+    return MsgspecResponse({
+        "batch_id": secrets.token_hex(16),
+        "total_files": len(batch.file_ids),
+        "successful": successful,
+        "failed": len(results) - successful,
+        "results": results
+    })
 
-@app.post("/analyze/{file_id}", response_model=AIResponse)
-async def analyze_file(file_id: str, request: AIRequest):
+@app.post("/analyze/{file_id}")
+async def analyze_file(file_id: str, request: AIRequest = Depends(msgspec_body(AIRequest))):
     """Analyze a file using mock AI models"""
+    return MsgspecResponse(await run_analysis(file_id, request))
+
+async def run_analysis(file_id: str, request: AIRequest) -> AIResponse:
+    """Produce the mock analysis for one file"""
     try:
-        # Simulate AI processing delay (1-3 seconds)
-        import asyncio
-        await asyncio.sleep(random.uniform(1, 3))
+        # Optional simulated processing delay (off by default)
+        if MOCK_LATENCY:
+            await asyncio.sleep(MOCK_LATENCY)
         
         # Determine analysis type based on file_id (mock logic)
         if "image" in file_id.lower() or file_id.startswith("img"):
@@ -82,49 +172,37 @@ async def analyze_file(file_id: str, request: AIRequest):
         else:
             analysis_category = "general"
         
-        # Generate mock results
-        base_results = MOCK_AI_RESPONSES.get(analysis_category, MOCK_AI_RESPONSES["general"])
-        
         # Add some randomness to make results more realistic
         confidence = random.uniform(0.6, 0.95)
-        processing_time = random.uniform(0.5, 2.0)
         
-        # Create results with variation
-        results = base_results.copy()
-        results.update({
+        # Create results with variation from the category template
+        results = {
+            **MOCK_AI_RESPONSES[analysis_category],
             "confidence": confidence,
-            "processing_time": processing_time,
-            "analysis_id": str(uuid.uuid4()),
-            "model": f"mock-ai-{analysis_category}-v1.0",
+            "processing_time": random.uniform(0.5, 2.0),
+            "analysis_id": secrets.token_hex(16),
+            "model": _MODEL_NAMES[analysis_category],
             "version": "1.0.0"
-        })
+        }
         
         # Add analysis-specific results
         if request.analysis_type == "classification":
             results["classification"] = {
-                "category": random.choice(["personal", "business", "educational", "entertainment"]),
-                "subcategory": random.choice(["document", "media", "archive", "other"]),
-                "tags": random.sample(["important", "draft", "final", "shared"], 2)
+                "category": random.choice(_CLASSIFICATION_CATEGORIES),
+                "subcategory": random.choice(_CLASSIFICATION_SUBCATEGORIES),
+                "tags": random.sample(_CLASSIFICATION_TAGS, 2)
             }
         elif request.analysis_type == "vision":
             results["vision_analysis"] = {
                 "object_detection": [
                     {"object": obj, "confidence": random.uniform(0.7, 0.95)}
-                    for obj in random.sample(MOCK_AI_RESPONSES["image"]["objects"], 3)
+                    for obj in random.sample(_DETECTABLE_OBJECTS, 3)
                 ],
-                "scene_classification": random.choice(["indoor", "outdoor", "nature", "urban"]),
+                "scene_classification": random.choice(_SCENES),
                 "nsfw_score": random.uniform(0.0, 0.1)  # Low for demo
             }
         elif request.analysis_type == "nlp":
-            results["nlp_analysis"] = {
-                "entities": [
-                    {"text": "Sample Corp", "label": "ORG"},
-                    {"text": "John Doe", "label": "PERSON"},
-                    {"text": "New York", "label": "LOC"}
-                ],
-                "summary": "This document contains sample business content.",
-                "keywords": ["business", "sample", "document"]
-            }
+            results["nlp_analysis"] = _NLP_ANALYSIS
         
         logger.info(f"AI analysis completed for {file_id} with {request.analysis_type}")
         
@@ -134,7 +212,7 @@ async def analyze_file(file_id: str, request: AIRequest):
             results=results,
             confidence=confidence,
             model_version="mock-ai-v1.0",
-            timestamp=datetime.now().isoformat()
+            timestamp=_iso_now()
         )
         
     except Exception as e:
@@ -144,16 +222,20 @@ async def analyze_file(file_id: str, request: AIRequest):
 @app.get("/analyze/{file_id}/history")
 async def get_analysis_history(file_id: str):
     """Get analysis history for a file (mock implementation)"""
-    # Generate mock history
-    history = []
-    for i in range(random.randint(1, 5)):
-        history.append({
-            "analysis_id": str(uuid.uuid4()),
-            "analysis_type": random.choice(["general", "vision", "nlp", "classification"]),
-            "timestamp": (datetime.now() - timedelta(hours=i)).isoformat(),
+    # Generate mock history, newest first, one hour apart
+    count = random.randint(1, 5)
+    analysis_types = random.choices(_ANALYSIS_TYPES, k=count)
+    now = datetime.utcfromtimestamp(int(time.time()))
+    history = [
+        {
+            "analysis_id": secrets.token_hex(16),
+            "analysis_type": analysis_type,
+            "timestamp": (now - timedelta(hours=i)).isoformat() + "Z",
             "confidence": random.uniform(0.6, 0.9),
             "model_version": f"mock-ai-v1.{i}"
-        })
+        }
+        for i, analysis_type in enumerate(analysis_types)
+    ]
     
     return {
         "file_id": file_id,
@@ -193,27 +275,6 @@ async def get_available_models():
         ]
     }
 
-@app.post("/analyze/batch")
-async def batch_analyze_files(file_ids: list[str], analysis_type: str = "general"):
-    """Analyze multiple files in batch"""
-    results = []
-    
-    for file_id in file_ids:
-        try:
-            result = await analyze_file(file_id, AIRequest(analysis_type=analysis_type))
-            results.append({"file_id": file_id, "status": "success", "result": result})
-        except Exception as e:
-            results.append({"file_id": file_id, "status": "failed", "error": str(e)})
-    
-    return {
-        "batch_id": str(uuid.uuid4()),
-        "total_files": len(file_ids),
-        "successful": len([r for r in results if r["status"] == "success"]),
-        "failed": len([r for r in results if r["status"] == "failed"]),
-        "results": results
-    }
-
 if __name__ == "__main__":
     import uvicorn
-    from datetime import timedelta
     uvicorn.run(app, host="0.0.0.0", port=8003)
\ No newline at end of file
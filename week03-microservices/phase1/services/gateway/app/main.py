@@ -2,6 +2,7 @@ from fastapi import FastAPI, UploadFile, File, HTTPException, BackgroundTasks
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 from datetime import datetime
+from contextlib import asynccontextmanager
 import httpx
 import asyncio
 import logging
@@ -16,7 +17,18 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="Phase 1 Gateway Service", version="1.0.0")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Share one pooled HTTP client for all downstream calls"""
+    # Keep-alive connections are reused across requests instead of reconnecting per call
+    app.state.http = httpx.AsyncClient(
+        timeout=httpx.Timeout(30.0),
+        limits=httpx.Limits(max_keepalive_connections=100, max_connections=200, keepalive_expiry=30.0)
+    )
+    yield
+    await app.state.http.aclose()
+
+app = FastAPI(title="Phase 1 Gateway Service", version="1.0.0", lifespan=lifespan)
 
 # Service URLs (configurable via environment variables)
 UPLOAD_SERVICE_URL = os.getenv("UPLOAD_SERVICE_URL", "http://localhost:8001")
@@ -51,26 +63,28 @@ async def health_check():
         "ai": {"url": f"{AI_SERVICE_URL}/health", "status": "unknown"}
     }
     
-    async with httpx.AsyncClient(timeout=5.0) as client:
-        for service_name, service_info in services.items():
-            try:
-                if service_name == "gateway":
-                    service_info["status"] = "healthy"
-                    continue
-                    
-                response = await client.get(service_info["url"])
-                if response.status_code == 200:
-                    service_info["status"] = "healthy"
-                else:
-                    service_info["status"] = f"unhealthy ({response.status_code})"
-            except Exception as e:
-                service_info["status"] = f"unreachable: {str(e)}"
+    services["gateway"]["status"] = "healthy"
+    
+    # Probe the downstream services concurrently so the check costs the slowest RTT, not the sum
+    probes = {name: info for name, info in services.items() if name != "gateway"}
+    client = app.state.http
+    results = await asyncio.gather(
+        *(client.get(info["url"], timeout=2.0) for info in probes.values()),
+        return_exceptions=True
+    )
+    for service_info, result in zip(probes.values(), results):
+        if isinstance(result, Exception):
+            service_info["status"] = f"unreachable: {str(result)}"
+        elif result.status_code == 200:
+            service_info["status"] = "healthy"
+        else:
+            service_info["status"] = f"unhealthy ({result.status_code})"
     
     total_time = (datetime.now() - start_time).total_seconds()
     
     # Determine overall status
     overall_status = "healthy"
-    if any(service["status"] != "healthy" for service in services.values() if service_name != "gateway"):
+    if any(service["status"] != "healthy" for service in probes.values()):
         overall_status = "degraded"
     
     return {
@@ -164,22 +178,22 @@ async def process_existing_file(
 async def upload_file(file: UploadFile) -> Dict[str, Any]:
     """Helper function to upload file to upload service"""
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            files = {"file": (file.filename, file.file, file.content_type)}
-            
-            response = await client.post(
-                f"{UPLOAD_SERVICE_URL}/upload",
-                files=files
+        client = app.state.http
+        files = {"file": (file.filename, file.file, file.content_type)}
+        
+        response = await client.post(
+            f"{UPLOAD_SERVICE_URL}/upload",
+            files=files
+        )
+        
+        if response.status_code != 200:
+            raise HTTPException(
+                status_code=response.status_code,
+                detail=f"Upload service error: {response.text}"
             )
-            
-            if response.status_code != 200:
-                raise HTTPException(
-                    status_code=response.status_code,
-                    detail=f"Upload service error: {response.text}"
-                )
-            
-            return response.json()
-            
+        
+        return response.json()
+        
     except httpx.ConnectError:
         raise HTTPException(status_code=503, detail="Upload service unavailable")
     except Exception as e:
@@ -189,20 +203,20 @@ async def upload_file(file: UploadFile) -> Dict[str, Any]:
 async def process_file(file_id: str, operation: str) -> Dict[str, Any]:
     """Helper function to process file"""
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post(
-                f"{PROCESSING_SERVICE_URL}/process/{file_id}",
-                json={"operation": operation, "parameters": {}}
+        client = app.state.http
+        response = await client.post(
+            f"{PROCESSING_SERVICE_URL}/process/{file_id}",
+            json={"operation": operation, "parameters": {}}
+        )
+        
+        if response.status_code != 200:
+            raise HTTPException(
+                status_code=response.status_code,
+                detail=f"Processing service error: {response.text}"
             )
-            
-            if response.status_code != 200:
-                raise HTTPException(
-                    status_code=response.status_code,
-                    detail=f"Processing service error: {response.text}"
-                )
-            
-            return response.json()
-            
+        
+        return response.json()
+        
     except httpx.ConnectError:
         raise HTTPException(status_code=503, detail="Processing service unavailable")
     except Exception as e:
@@ -212,20 +226,20 @@ async def process_file(file_id: str, operation: str) -> Dict[str, Any]:
 async def analyze_file(file_id: str, analysis_type: str) -> Dict[str, Any]:
     """Helper function to analyze file with AI"""
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post(
-                f"{AI_SERVICE_URL}/analyze/{file_id}",
-                json={"analysis_type": analysis_type, "confidence_threshold": 0.7}
+        client = app.state.http
+        response = await client.post(
+            f"{AI_SERVICE_URL}/analyze/{file_id}",
+            json={"analysis_type": analysis_type, "confidence_threshold": 0.7}
+        )
+        
+        if response.status_code != 200:
+            raise HTTPException(
+                status_code=response.status_code,
+                detail=f"AI service error: {response.text}"
             )
-            
-            if response.status_code != 200:
-                raise HTTPException(
-                    status_code=response.status_code,
-                    detail=f"AI service error: {response.text}"
-                )
-            
-            return response.json()
-            
+        
+        return response.json()
+        
     except httpx.ConnectError:
         raise HTTPException(status_code=503, detail="AI service unavailable")
     except Exception as e:
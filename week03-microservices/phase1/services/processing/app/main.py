@@ -1,5 +1,5 @@
 from fastapi import FastAPI, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from pydantic import BaseModel
 from datetime import datetime
 import asyncio
@@ -7,6 +7,7 @@ import json
 from pathlib import Path
 import logging
 import uuid
+from services.common.health import HealthBody, HealthCheckInterceptor
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -30,10 +31,14 @@ class ProcessingResponse(BaseModel):
     processing_time: float
     timestamp: str
 
+# Liveness probes hit /health constantly; answer them before routing and validation
+health_body = HealthBody("processing-service")
+app.add_middleware(HealthCheckInterceptor, body=health_body)
+
 @app.get("/health")
 async def health_check():
-    """Health check endpoint"""
-    return {"status": "healthy", "service": "processing-service", "timestamp": datetime.now().isoformat()}
+    """Health check endpoint (answered by HealthCheckInterceptor; kept for the OpenAPI docs)"""
+    return Response(health_body(), media_type="application/json")
 
 @app.post("/process/{file_id}", response_model=ProcessingResponse)
 async def process_file(file_id: str, request: ProcessingRequest):